@@ -0,0 +1,181 @@
+"""
+Однопроходная агрегация результатов тренировок по группам.
+
+``Aggregator`` принимает поток результатов (``InfoMessage``, объектов
+``Training`` или пакетных ``batch.BatchResult``) и держит в словаре
+накопленные суммы по ключу (пользователь, вид тренировки, интервал
+времени). Память зависит только от числа групп, а не от числа записей.
+"""
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+from homework import InfoMessage, Training
+
+# измерения ключа группы
+DIMENSIONS = ('user', 'training_type', 'bucket')
+
+GroupKey = Tuple[Hashable, ...]
+
+
+@dataclass
+class GroupTotals:
+    """Накопленные значения одной группы."""
+
+    count: int = 0              # Количество тренировок
+    duration: float = 0.0       # Суммарная длительность (в часах)
+    distance: float = 0.0       # Суммарная дистанция (в км)
+    calories: float = 0.0       # Суммарные килокалории
+    speed_duration: float = 0.0  # Сумма скорость * длительность
+
+    @property
+    def mean_speed(self) -> float:
+        """Средняя скорость, взвешенная по длительности тренировок."""
+        return self.speed_duration / self.duration if self.duration else 0.0
+
+    def add(self, info: InfoMessage) -> None:
+        self.count += 1
+        self.duration += info.duration
+        self.distance += info.distance
+        self.calories += info.calories
+        self.speed_duration += info.speed * info.duration
+
+    def merge(self, other: 'GroupTotals') -> None:
+        self.count += other.count
+        self.duration += other.duration
+        self.distance += other.distance
+        self.calories += other.calories
+        self.speed_duration += other.speed_duration
+
+
+def _codes(values: Optional[Sequence], size: int) -> Tuple[list, object]:
+    """
+    Различные значения столбца и номер значения для каждой строки.
+    ``None`` вместо столбца означает одно значение ``None`` у всех строк.
+    """
+    import numpy as np
+
+    if values is None:
+        return [None], np.zeros(size, dtype=np.intp)
+    if isinstance(values, np.ndarray):
+        uniform = values.dtype.kind in 'iufU'
+    else:
+        # np.asarray приводит [1, '1'] к строкам: NumPy годится, только
+        # если все значения одного числового или строкового типа
+        kinds = {type(value) for value in values}
+        uniform = len(kinds) == 1 and kinds <= {int, float, str}
+    if uniform:
+        unique, codes = np.unique(np.asarray(values), return_inverse=True)
+        return unique.tolist(), codes.ravel()
+    # остальные значения нумеруем словарём, ключи как у ``add``
+    index: Dict[Hashable, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index))
+                         for value in values), dtype=np.intp, count=size)
+    return list(index), codes
+
+
+class Aggregator:
+    """
+    Агрегатор результатов по пользователю, виду тренировки и времени.
+
+    Входные переменные:
+    - bucket_seconds - ширина интервала времени в секундах (например,
+      неделя - 7 * 24 * 3600); если не задана, время не учитывается
+    """
+
+    def __init__(self, bucket_seconds: Optional[float] = None) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.groups: Dict[GroupKey, GroupTotals] = {}
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def _bucket(self, timestamp: Optional[float]) -> Optional[float]:
+        if self.bucket_seconds is None or timestamp is None:
+            return None
+        return timestamp - timestamp % self.bucket_seconds
+
+    def add(self, info: InfoMessage, user: Hashable = None,
+            timestamp: Optional[float] = None) -> None:
+        """Учесть одно сообщение о тренировке."""
+        key = (user, info.training_type, self._bucket(timestamp))
+        totals = self.groups.get(key)
+        if totals is None:
+            totals = self.groups[key] = GroupTotals()
+        totals.add(info)
+
+    def add_training(self, training: Training, user: Hashable = None,
+                     timestamp: Optional[float] = None) -> None:
+        """Учесть тренировку (например, результат ``read_package``)."""
+        self.add(training.show_training_info(), user, timestamp)
+
+    def add_batch(self, result, users: Optional[Sequence] = None,
+                  timestamps: Optional[Sequence[float]] = None) -> None:
+        """
+        Учесть результат ``batch.compute_batch``.
+
+        Строки группируются средствами NumPy, суммы считаются по столбцам
+        через ``bincount``; объекты создаются только на группу.
+        """
+        import numpy as np
+
+        size = len(result)
+        if not size:
+            return
+        user_values, user_codes = _codes(users, size)
+        if self.bucket_seconds is None or timestamps is None:
+            bucket_values, bucket_codes = _codes(None, size)
+        else:
+            times = np.asarray(timestamps, dtype=np.float64)
+            bucket_values, bucket_codes = _codes(
+                times - times % self.bucket_seconds, size)
+        groups, inverse = np.unique(
+            user_codes * len(bucket_values) + bucket_codes,
+            return_inverse=True)
+        inverse = inverse.ravel()
+
+        def total(values) -> list:
+            return np.bincount(inverse, weights=values,
+                               minlength=len(groups)).tolist()
+
+        duration = np.asarray(result.duration, dtype=np.float64)
+        sums = zip(np.bincount(inverse, minlength=len(groups)).tolist(),
+                   total(duration), total(result.distance),
+                   total(result.calories), total(result.speed * duration))
+        for group, (count, *values) in zip(groups.tolist(), sums):
+            user, bucket = divmod(group, len(bucket_values))
+            key = (user_values[user], result.training_type,
+                   bucket_values[bucket])
+            self.groups.setdefault(key, GroupTotals()).merge(
+                GroupTotals(count, *values))
+
+    def consume(self, records: Iterable[Tuple[Hashable, Optional[float],
+                                              InfoMessage]]) -> None:
+        """Учесть поток записей ``(user, timestamp, info)``."""
+        for user, timestamp, info in records:
+            self.add(info, user, timestamp)
+
+    def merge(self, other: 'Aggregator') -> None:
+        """Добавить группы другого агрегатора (например, из воркера)."""
+        if other.bucket_seconds != self.bucket_seconds:
+            raise ValueError("Нельзя объединить агрегаторы с разными "
+                             "интервалами времени")
+        for key, totals in other.groups.items():
+            self.groups.setdefault(key, GroupTotals()).merge(totals)
+
+    def report(self, by: Sequence[str] = DIMENSIONS
+               ) -> Dict[GroupKey, GroupTotals]:
+        """
+        Итоги, сгруппированные по части измерений.
+
+        ``by`` - подмножество ``DIMENSIONS``, например
+        ``('user', 'bucket')`` для недельных итогов каждого спортсмена.
+        """
+        unknown = [name for name in by if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Неизвестные измерения: {', '.join(unknown)}")
+        positions = [DIMENSIONS.index(name) for name in by]
+        result: Dict[GroupKey, GroupTotals] = {}
+        for key, totals in self.groups.items():
+            group = tuple(key[position] for position in positions)
+            result.setdefault(group, GroupTotals()).merge(totals)
+        return result
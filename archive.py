@@ -0,0 +1,467 @@
+"""
+Сжатый архив исходных пакетов датчиков.
+
+Пакеты ``(workout_type, data)`` с отметкой времени пишутся блоками по
+``block_records`` записей. Внутри блока данные разложены по столбцам:
+
+- коды тренировок - словарём: один байт на запись, сам словарь (код и
+  число значений в пакете) хранится в оглавлении файла;
+- отметки времени (в миллисекундах) и ``action`` - разности соседних
+  значений в формате zigzag varint;
+- остальные значения пакета - столбцы ``float64`` по позиции в пакете.
+
+Блок сжимается ``zlib``. В конце файла лежит оглавление: словарь кодов
+и индекс блоков с диапазоном времени каждого, поэтому чтение за период
+распаковывает только нужные блоки.
+
+``ArchiveReader`` отдаёт пакеты поштучно (``packages()``,
+``trainings()``) либо столбцами для ``batch.compute_batch``
+(``column_blocks()``, ``batches()``): во втором случае блок
+раскодируется средствами NumPy без цикла по записям.
+
+Запуск: ``python archive.py pack пакеты.jsonl архив.trka`` и
+``python archive.py replay архив.trka``.
+"""
+import argparse
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import fields
+from typing import (BinaryIO, Dict, Iterable, Iterator, List, NamedTuple,
+                    Optional, Sequence, Tuple)
+
+from homework import WORKOUT_TYPES, Training, read_packages
+
+MAGIC = b'TRKA'
+VERSION = 1
+HEADER = struct.Struct('<4sH')
+# смещение оглавления и подпись в конце файла
+TRAILER = struct.Struct('<Q4s')
+CODE = struct.Struct('<BB')
+BLOCK = struct.Struct('<QIIqq')
+# число записей и размеры секций отметок времени и action в блоке
+PAYLOAD = struct.Struct('<III')
+MAX_CODES = 256
+DEFAULT_BLOCK_RECORDS = 4096
+DEFAULT_LEVEL = 6
+MS_IN_SECOND = 1000
+
+Package = Tuple[str, Sequence[float]]
+
+
+class BlockIndex(NamedTuple):
+    """Запись индекса: где лежит блок и какой период он покрывает."""
+
+    offset: int     # Смещение сжатого блока в файле
+    size: int       # Размер сжатого блока
+    count: int      # Количество записей
+    start: int      # Первая отметка времени (мс)
+    end: int        # Последняя отметка времени (мс)
+
+
+def _write_varints(out: bytearray, values: Iterable[int]) -> None:
+    """Записать разности значений в формате zigzag varint."""
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        delta = delta << 1 if delta >= 0 else ((-delta) << 1) - 1
+        while delta >= 0x80:
+            out.append(delta & 0x7f | 0x80)
+            delta >>= 7
+        out.append(delta)
+
+
+def _read_varints(data: bytes, count: int) -> List[int]:
+    """Обратное к ``_write_varints``: восстановить ``count`` значений."""
+    values = []
+    value = 0
+    position = 0
+    for _ in range(count):
+        delta = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            delta |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        value += (delta >> 1) ^ -(delta & 1)
+        values.append(value)
+    return values
+
+
+def _read_varints_numpy(data: bytes, count: int):
+    """То же, что ``_read_varints``, но векторно средствами NumPy."""
+    import numpy as np
+
+    if not count:
+        return np.zeros(0, dtype=np.int64)
+    raw = np.frombuffer(data, dtype=np.uint8)
+    last = raw < 0x80
+    starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    group = np.cumsum(np.concatenate(([0], last[:-1])))
+    shift = (np.arange(len(raw)) - starts[group]) * 7
+    parts = (raw & 0x7f).astype(np.uint64) << shift.astype(np.uint64)
+    deltas = np.bitwise_or.reduceat(parts, starts)
+    signed = ((deltas >> np.uint64(1)).astype(np.int64)
+              ^ -(deltas & np.uint64(1)).astype(np.int64))
+    return np.cumsum(signed)
+
+
+def _float_bytes(values: List[float]) -> bytes:
+    column = array('d', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _floats(data: bytes) -> List[float]:
+    column = array('d')
+    column.frombytes(data)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tolist()
+
+
+def column_names(workout_type: str, arity: int) -> List[str]:
+    """Названия значений пакета: поля класса тренировки либо номера."""
+    cls = WORKOUT_TYPES.get(workout_type)
+    if cls is not None and len(fields(cls)) == arity:
+        return [field.name for field in fields(cls)]
+    return ['action'] + [f'value{position}'
+                         for position in range(1, arity)]
+
+
+class ArchiveWriter:
+    """
+    Запись пакетов в сжатый архив.
+
+    Входные переменные:
+    - path - путь к файлу
+    - block_records - сколько записей помещать в один блок
+    - level - степень сжатия ``zlib``
+    """
+
+    def __init__(self, path: str,
+                 block_records: int = DEFAULT_BLOCK_RECORDS,
+                 level: int = DEFAULT_LEVEL) -> None:
+        self.path = path
+        self.block_records = block_records
+        self.level = level
+        self.codes: List[str] = []
+        self.arities: List[int] = []
+        self.blocks: List[BlockIndex] = []
+        self.count = 0
+        self._code_index: Dict[str, int] = {}
+        self._block: List[Tuple[int, int, Sequence[float]]] = []
+        self._file: BinaryIO = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _code(self, workout_type: str, arity: int) -> int:
+        code = self._code_index.get(workout_type)
+        if code is None:
+            if len(self.codes) >= MAX_CODES:
+                raise ValueError(
+                    f"В архиве может быть не больше {MAX_CODES} кодов "
+                    "тренировок"
+                )
+            code = self._code_index[workout_type] = len(self.codes)
+            self.codes.append(workout_type)
+            self.arities.append(arity)
+        elif self.arities[code] != arity:
+            raise ValueError(
+                f"Пакеты {workout_type} должны содержать "
+                f"{self.arities[code]} значений, получено {arity}"
+            )
+        return code
+
+    def write(self, workout_type: str, data: Sequence[float],
+              timestamp: float = 0) -> None:
+        """
+        Добавить пакет. ``timestamp`` - время пакета в секундах,
+        хранится с точностью до миллисекунды.
+        """
+        if not data or data[0] != int(data[0]):
+            raise ValueError(
+                f"Количество действий должно быть целым, получено "
+                f"{data[0] if data else None}"
+            )
+        code = self._code(workout_type, len(data))
+        self._block.append((round(timestamp * MS_IN_SECOND), code, data))
+        self.count += 1
+        if len(self._block) >= self.block_records:
+            self.flush()
+
+    def write_many(self, packages: Iterable[Package],
+                   timestamps: Optional[Iterable[float]] = None) -> None:
+        if timestamps is None:
+            for workout_type, data in packages:
+                self.write(workout_type, data)
+        else:
+            for (workout_type, data), timestamp in zip(packages,
+                                                       timestamps):
+                self.write(workout_type, data, timestamp)
+
+    def flush(self) -> None:
+        """Сжать и записать накопленный блок."""
+        block = self._block
+        if not block:
+            return
+        times = [record[0] for record in block]
+        payload = bytearray()
+        _write_varints(payload, times)
+        times_size = len(payload)
+        _write_varints(payload, (int(record[2][0]) for record in block))
+        action_size = len(payload) - times_size
+        payload += bytes(record[1] for record in block)
+        for position in range(1, max(self.arities)):
+            payload += _float_bytes([record[2][position]
+                                     for record in block
+                                     if len(record[2]) > position])
+        compressed = zlib.compress(
+            PAYLOAD.pack(len(block), times_size, action_size) + payload,
+            self.level)
+        self.blocks.append(BlockIndex(self._file.tell(), len(compressed),
+                                      len(block), min(times), max(times)))
+        self._file.write(compressed)
+        self._block = []
+
+    def close(self) -> None:
+        """Дописать последний блок и оглавление и закрыть файл."""
+        if self._file.closed:
+            return
+        self.flush()
+        index_offset = self._file.tell()
+        index = bytearray(struct.pack('<H', len(self.codes)))
+        for code, arity in zip(self.codes, self.arities):
+            name = code.encode('utf-8')
+            index += CODE.pack(len(name), arity) + name
+        index += struct.pack('<I', len(self.blocks))
+        for block in self.blocks:
+            index += BLOCK.pack(*block)
+        self._file.write(bytes(index))
+        self._file.write(TRAILER.pack(index_offset, MAGIC))
+        self._file.close()
+
+
+class ArchiveReader:
+    """
+    Чтение сжатого архива пакетов.
+
+    Периоды задаются в секундах: ``start`` включительно, ``end`` не
+    включительно; ``None`` - без ограничения.
+
+    Входные переменные:
+    - path - путь к файлу
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as source:
+            self._mmap = mmap.mmap(source.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+
+    def _read_index(self) -> None:
+        data = self._mmap
+        if len(data) < HEADER.size + TRAILER.size:
+            raise ValueError("Файл не является архивом пакетов")
+        magic, version = HEADER.unpack_from(data, 0)
+        index_offset, tail = TRAILER.unpack_from(data,
+                                                 len(data) - TRAILER.size)
+        if magic != MAGIC or tail != MAGIC or version != VERSION:
+            raise ValueError("Файл не является архивом пакетов")
+        (count,) = struct.unpack_from('<H', data, index_offset)
+        position = index_offset + 2
+        self.codes: List[str] = []
+        self.arities: List[int] = []
+        for _ in range(count):
+            size, arity = CODE.unpack_from(data, position)
+            position += CODE.size
+            self.codes.append(
+                data[position:position + size].decode('utf-8'))
+            self.arities.append(arity)
+            position += size
+        (count,) = struct.unpack_from('<I', data, position)
+        position += 4
+        self.blocks: List[BlockIndex] = [
+            BlockIndex(*BLOCK.unpack_from(data, position + i * BLOCK.size))
+            for i in range(count)
+        ]
+        self.count = sum(block.count for block in self.blocks)
+
+    def __enter__(self) -> 'ArchiveReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    @staticmethod
+    def _bounds(start: Optional[float],
+                end: Optional[float]) -> Tuple[float, float]:
+        return (float('-inf') if start is None else start * MS_IN_SECOND,
+                float('inf') if end is None else end * MS_IN_SECOND)
+
+    def select(self, start: Optional[float] = None,
+               end: Optional[float] = None) -> List[int]:
+        """Номера блоков, в которых могут быть пакеты за период."""
+        low, high = self._bounds(start, end)
+        return [number for number, block in enumerate(self.blocks)
+                if block.end >= low and block.start < high]
+
+    def _payload(self, number: int) -> Tuple[int, bytes, bytes, bytes,
+                                             List[bytes]]:
+        """Распаковать блок и разрезать его на секции."""
+        block = self.blocks[number]
+        payload = zlib.decompress(
+            self._mmap[block.offset:block.offset + block.size])
+        count, times_size, action_size = PAYLOAD.unpack_from(payload, 0)
+        position = PAYLOAD.size
+        times = payload[position:position + times_size]
+        position += times_size
+        action = payload[position:position + action_size]
+        position += action_size
+        codes = payload[position:position + count]
+        position += count
+        counts = [codes.count(code) for code in range(len(self.codes))]
+        floats = []
+        for column in range(1, max(self.arities)):
+            size = 8 * sum(number for number, arity
+                           in zip(counts, self.arities) if arity > column)
+            floats.append(payload[position:position + size])
+            position += size
+        return count, times, action, codes, floats
+
+    def records(self, start: Optional[float] = None,
+                end: Optional[float] = None
+                ) -> Iterator[Tuple[float, str, List[float]]]:
+        """Пакеты за период как ``(время, код, данные)``."""
+        low, high = self._bounds(start, end)
+        names = self.codes
+        for number in self.select(start, end):
+            count, times, action, codes, floats = self._payload(number)
+            columns = [iter(_floats(column)) for column in floats]
+            for time, steps, code in zip(_read_varints(times, count),
+                                         _read_varints(action, count),
+                                         codes):
+                data = [steps]
+                data.extend(next(column)
+                            for column in columns[:self.arities[code] - 1])
+                if low <= time < high:
+                    yield time / MS_IN_SECOND, names[code], data
+
+    def packages(self, start: Optional[float] = None,
+                 end: Optional[float] = None) -> Iterator[Package]:
+        """Пакеты ``(workout_type, data)`` за период, как в ``main``."""
+        for _, workout_type, data in self.records(start, end):
+            yield workout_type, data
+
+    def trainings(self, start: Optional[float] = None,
+                  end: Optional[float] = None) -> Iterator[Training]:
+        """Объекты тренировок за период через ``read_packages``."""
+        return read_packages(self.packages(start, end))
+
+    def column_blocks(self, start: Optional[float] = None,
+                      end: Optional[float] = None
+                      ) -> Iterator[Dict[str, dict]]:
+        """
+        Блоки как столбцы NumPy: ``{код: {название: массив}}``.
+
+        Названия столбцов совпадают с полями класса тренировки, поэтому
+        словарь кода можно сразу передать в ``batch.compute_batch``.
+        Отметки времени (в секундах) лежат в столбце ``timestamp``.
+        """
+        import numpy as np
+
+        low, high = self._bounds(start, end)
+        arities = np.array(self.arities)
+        for number in self.select(start, end):
+            count, times, action, codes, floats = self._payload(number)
+            times = _read_varints_numpy(times, count)
+            inside = (times >= low) & (times < high)
+            codes = np.frombuffer(codes, dtype=np.uint8)
+            block_arities = arities[codes]
+            columns = []
+            for position, data in enumerate(floats, 1):
+                present = block_arities > position
+                slot = np.cumsum(present) - 1
+                values = np.frombuffer(data, dtype='<f8')
+                columns.append((present, slot, values))
+            actions = _read_varints_numpy(action, count).astype(np.float64)
+            result = {}
+            for code in np.unique(codes):
+                rows = (codes == code) & inside
+                if not rows.any():
+                    continue
+                workout_type = self.codes[code]
+                names = column_names(workout_type, self.arities[code])
+                arrays = {'timestamp': times[rows] / MS_IN_SECOND,
+                          names[0]: actions[rows]}
+                for name, (_, slot, values) in zip(names[1:], columns):
+                    arrays[name] = values[slot[rows]]
+                result[workout_type] = arrays
+            if result:
+                yield result
+
+    def batches(self, start: Optional[float] = None,
+                end: Optional[float] = None) -> Iterator:
+        """Результаты ``compute_batch`` по блокам и видам тренировок."""
+        from batch import BATCH_WORKOUTS, compute_batch
+
+        for block in self.column_blocks(start, end):
+            for workout_type, columns in block.items():
+                if workout_type in BATCH_WORKOUTS:
+                    yield compute_batch(workout_type, columns)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    from stream import FORMATS, guess_format, process_stream, read_records
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+    pack = commands.add_parser('pack', help='упаковать пакеты в архив')
+    pack.add_argument('source', help='файл с пакетами (csv или jsonl)')
+    pack.add_argument('archive')
+    pack.add_argument('--format', choices=FORMATS, default=None)
+    pack.add_argument('--block-records', type=int,
+                      default=DEFAULT_BLOCK_RECORDS)
+    replay = commands.add_parser('replay',
+                                 help='вывести сообщения по архиву')
+    replay.add_argument('archive')
+    replay.add_argument('--start', type=float, default=None)
+    replay.add_argument('--end', type=float, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'pack':
+        fmt = args.format or guess_format(args.source)
+        with open(args.source, encoding='utf-8', newline='') as source, \
+                ArchiveWriter(args.archive, args.block_records) as writer:
+            writer.write_many(read_records(source, fmt))
+            return writer.count
+    with ArchiveReader(args.archive) as reader:
+        return process_stream(reader.packages(args.start, args.end),
+                              sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
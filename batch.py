@@ -0,0 +1,135 @@
+"""
+Пакетный (векторизованный) расчёт результатов тренировок.
+
+Вместо создания объекта ``Training`` на каждый пакет данные передаются
+столбцами, а дистанция, скорость и калории считаются сразу для всего
+столбца средствами NumPy. Формулы и порядок операций повторяют методы
+классов из ``homework``, константы берутся из тех же классов.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from homework import InfoMessage, Running, SportsWalking, Swimming
+
+Columns = Mapping[str, Sequence[float]]
+
+
+@dataclass
+class BatchResult:
+    """
+    Результаты пакетного расчёта.
+    Поля совпадают с полями ``InfoMessage``, но хранят массивы.
+    """
+
+    training_type: str      # Название тренировки
+    duration: np.ndarray    # Длительность (в часах)
+    distance: np.ndarray    # Дистанция (в км)
+    speed: np.ndarray       # Скорость (в км/ч)
+    calories: np.ndarray    # Килокалории
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+    def info_message(self, index: int) -> InfoMessage:
+        """Возвращает ``InfoMessage`` для одной записи пакета."""
+        return InfoMessage(self.training_type,
+                           float(self.duration[index]),
+                           float(self.distance[index]),
+                           float(self.speed[index]),
+                           float(self.calories[index]))
+
+
+def _distance(k, action: np.ndarray) -> np.ndarray:
+    """Аналог ``Training.get_distance()``."""
+    return action * k.LEN_STEP / k.M_IN_KM
+
+
+# Формулы получают столбцы ``c`` и константы ``k``: обычно это сам класс
+# тренировки, а при переборе коэффициентов (sweep.py) - объект, где
+# константы заданы массивами по вариантам.
+
+def _running(c: Dict[str, np.ndarray], k) -> Tuple[np.ndarray, ...]:
+    distance = _distance(k, c['action'])
+    speed = distance / c['duration']
+    calories = ((k.coeff_calorie_1 * speed
+                - k.coeff_calorie_2) * c['weight']
+                / k.M_IN_KM * c['duration'] * k.TIME_CONST)
+    return distance, speed, calories
+
+
+def _sports_walking(c: Dict[str, np.ndarray], k) -> Tuple[np.ndarray, ...]:
+    distance = _distance(k, c['action'])
+    speed = distance / c['duration']
+    calories = ((k.coeff_calorie_1
+                * c['weight']
+                + (speed ** k.coeff_calorie_3
+                    // c['height'])
+                * k.coeff_calorie_2 * c['weight'])
+                * k.TIME_CONST * c['duration'])
+    return distance, speed, calories
+
+
+def _swimming(c: Dict[str, np.ndarray], k) -> Tuple[np.ndarray, ...]:
+    distance = _distance(k, c['action'])
+    speed = (c['length_pool'] * c['count_pool']
+             / k.M_IN_KM / c['duration'])
+    calories = ((speed + k.coeff_calorie_1)
+                * k.coeff_calorie_2 * c['weight'])
+    return distance, speed, calories
+
+
+# код тренировки -> (класс, обязательные столбцы, векторная формула)
+BATCH_WORKOUTS: Dict[str, Tuple[type, Tuple[str, ...], Callable]] = {
+    'SWM': (Swimming,
+            ('action', 'duration', 'weight', 'length_pool', 'count_pool'),
+            _swimming),
+    'RUN': (Running, ('action', 'duration', 'weight'), _running),
+    'WLK': (SportsWalking,
+            ('action', 'duration', 'weight', 'height'),
+            _sports_walking),
+}
+
+
+def column_arrays(workout_type: str,
+                  columns: Columns) -> Dict[str, np.ndarray]:
+    """Проверить столбцы пакета и привести их к массивам float64."""
+    if workout_type not in BATCH_WORKOUTS:
+        raise ValueError(f"Такой тренировки - {workout_type}, не найдено")
+    _, required, _ = BATCH_WORKOUTS[workout_type]
+    missing = [name for name in required if name not in columns]
+    if missing:
+        raise ValueError(
+            f"Для тренировки {workout_type} не хватает столбцов: "
+            f"{', '.join(missing)}"
+        )
+    arrays = {name: np.asarray(columns[name], dtype=np.float64)
+              for name in required}
+    sizes = {len(array) for array in arrays.values()}
+    if len(sizes) > 1:
+        raise ValueError("Столбцы пакета должны быть одной длины")
+    return arrays
+
+
+def compute_batch(workout_type: str, columns: Columns) -> BatchResult:
+    """
+    Рассчитать результаты сразу для множества пакетов одного типа.
+
+    Входные параметры:
+    - workout_type - код тренировки ('SWM', 'RUN', 'WLK')
+    - columns - словарь столбцов: action, duration, weight и, в
+      зависимости от тренировки, height либо length_pool и count_pool
+
+    Возвращает:
+    - ``BatchResult`` с массивами дистанции, скорости и калорий
+
+    Деление на нулевую длительность не вызывает исключения, как в
+    поштучном расчёте, а даёт ``inf``/``nan`` в соответствующих строках.
+    """
+    arrays = column_arrays(workout_type, columns)
+    cls, _, formula = BATCH_WORKOUTS[workout_type]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distance, speed, calories = formula(arrays, cls)
+    return BatchResult(cls.__name__, arrays['duration'],
+                       distance, speed, calories)
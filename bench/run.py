@@ -0,0 +1,189 @@
+"""
+Замеры скорости горячих участков ``homework.py``.
+
+Для каждого вида тренировки (SWM, RUN, WLK) генерируются синтетические
+пакеты и замеряются ``read_package``, ``get_spent_calories``,
+``show_training_info``, ``get_message`` и полный цикл ``main``.
+Результат печатается и сохраняется в JSON для сравнения между коммитами.
+
+Запуск::
+
+    python bench/run.py --scales 1000,100000 --output bench.json
+    python bench/run.py --compare bench.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import homework  # noqa: E402
+
+WORKOUT_TYPES = ('SWM', 'RUN', 'WLK')
+DEFAULT_SCALES = (1_000, 100_000)
+# пакеты генерируются и замеряются порциями, чтобы 10M не держать в памяти
+CHUNK_SIZE = 100_000
+
+Package = Tuple[str, List[float]]
+
+
+def generate_packages(workout_type: str,
+                      count: int,
+                      seed: int = 0) -> Iterator[Package]:
+    """Лениво генерировать синтетические пакеты одного вида."""
+    rnd = random.Random(seed)
+    for _ in range(count):
+        data = [rnd.randint(100, 50_000), rnd.uniform(0.2, 3.0),
+                rnd.uniform(40, 120)]
+        if workout_type == 'WLK':
+            data.append(rnd.uniform(140, 210))
+        elif workout_type == 'SWM':
+            data.extend([rnd.choice((25, 50)), rnd.randint(1, 80)])
+        yield workout_type, data
+
+
+def _time(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_read_package(chunk: List[Package]) -> float:
+    read_package = homework.read_package
+    return _time(lambda: [read_package(code, data) for code, data in chunk])
+
+
+def bench_get_spent_calories(chunk: List[Package]) -> float:
+    trainings = [homework.read_package(code, data) for code, data in chunk]
+    return _time(lambda: [training.get_spent_calories()
+                          for training in trainings])
+
+
+def bench_show_training_info(chunk: List[Package]) -> float:
+    trainings = [homework.read_package(code, data) for code, data in chunk]
+    return _time(lambda: [training.show_training_info()
+                          for training in trainings])
+
+
+def bench_get_message(chunk: List[Package]) -> float:
+    messages = [homework.read_package(code, data).show_training_info()
+                for code, data in chunk]
+    return _time(lambda: [info.get_message() for info in messages])
+
+
+def bench_main(chunk: List[Package]) -> float:
+    def loop() -> None:
+        for code, data in chunk:
+            homework.main(homework.read_package(code, data))
+
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        return _time(loop)
+
+
+BENCHMARKS: Dict[str, Callable[[List[Package]], float]] = {
+    'read_package': bench_read_package,
+    'get_spent_calories': bench_get_spent_calories,
+    'show_training_info': bench_show_training_info,
+    'get_message': bench_get_message,
+    'main': bench_main,
+}
+
+
+def run_benchmark(name: str, workout_type: str, scale: int) -> Dict:
+    """Замерить один участок на ``scale`` пакетах."""
+    bench = BENCHMARKS[name]
+    seconds = 0.0
+    packages = generate_packages(workout_type, scale)
+    while True:
+        chunk = list(islice(packages, CHUNK_SIZE))
+        if not chunk:
+            break
+        seconds += bench(chunk)
+    return {
+        'name': name,
+        'workout_type': workout_type,
+        'scale': scale,
+        'seconds': seconds,
+        'per_second': scale / seconds if seconds else None,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, check=True,
+            capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(scales=DEFAULT_SCALES,
+            names=tuple(BENCHMARKS),
+            workout_types=WORKOUT_TYPES) -> Dict:
+    """Выполнить все замеры и вернуть отчёт."""
+    results = [run_benchmark(name, workout_type, scale)
+               for scale in scales
+               for name in names
+               for workout_type in workout_types]
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(report: Dict, baseline: Dict) -> List[str]:
+    """Строки сравнения отчёта с базовым: отношение времени к базе."""
+    base = {(r['name'], r['workout_type'], r['scale']): r['seconds']
+            for r in baseline['results']}
+    lines = []
+    for r in report['results']:
+        old = base.get((r['name'], r['workout_type'], r['scale']))
+        if old:
+            lines.append(f"{r['name']:<20} {r['workout_type']} "
+                         f"{r['scale']:>10} x{r['seconds'] / old:.2f}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--scales', default=','.join(
+        str(scale) for scale in DEFAULT_SCALES),
+        help='размеры наборов через запятую, например 1000,100000,10000000')
+    parser.add_argument('--only', default=None,
+                        help='замеры через запятую: ' + ', '.join(BENCHMARKS))
+    parser.add_argument('--output', default=None, help='файл для JSON')
+    parser.add_argument('--compare', default=None,
+                        help='JSON предыдущего прогона для сравнения')
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    names = args.only.split(',') if args.only else tuple(BENCHMARKS)
+    report = run_all(scales, names)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        print('\n'.join(compare(report, baseline)), file=sys.stderr)
+    return report
+
+
+if __name__ == '__main__':
+    main()
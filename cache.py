@@ -0,0 +1,284 @@
+"""
+Кэширование показателей тренировок и результатов ``read_package``.
+
+- ``with_cached_metrics()`` строит вариант класса тренировки, который
+  считает дистанцию, скорость и калории один раз на экземпляр и
+  сбрасывает их при изменении полей;
+- ``PackageCache`` - ограниченный LRU-кэш тренировок по ключу
+  ``(workout_type, data)`` для повторно присланных пакетов;
+- ``MessageCache`` - потокобезопасный LRU-кэш готовых строк сообщений
+  со сроком жизни записей и разбиением на сегменты с отдельными
+  блокировками (для многопоточных веб-обработчиков).
+
+Кэширование показателей включается только явно: в обычных классах
+перехват ``__setattr__`` замедлил бы создание каждого объекта.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from threading import Lock
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple, Type
+
+from homework import WORKOUT_TYPES, Training, _make_constructor, read_package
+
+DEFAULT_MAXSIZE = 65536
+DEFAULT_STRIPES = 16
+DEFAULT_TTL = 300.0
+
+# методы, результат которых кэшируется
+CACHED_METRICS = ('get_distance', 'get_mean_speed', 'get_spent_calories')
+
+
+def cached_metric(method: Callable[..., float]) -> Callable[..., float]:
+    """
+    Декоратор: вычислить показатель тренировки один раз.
+    Значение хранится в словаре ``_metrics`` экземпляра.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self) -> float:
+        metrics = self.__dict__.setdefault('_metrics', {})
+        if name not in metrics:
+            metrics[name] = method(self)
+        return metrics[name]
+
+    return wrapper
+
+
+@lru_cache(maxsize=None)
+def with_cached_metrics(cls: Type[Training]) -> Type[Training]:
+    """
+    Создать подкласс ``cls`` с кэшированием показателей.
+
+    Имя класса не меняется, поэтому сообщения о тренировке совпадают
+    с исходным классом. Изменение любого поля сбрасывает кэш.
+    """
+    def __setattr__(self, name: str, value: object) -> None:
+        object.__setattr__(self, name, value)
+        if name in self.__dataclass_fields__:
+            self.__dict__.pop('_metrics', None)
+
+    namespace = {name: cached_metric(getattr(cls, name))
+                 for name in CACHED_METRICS}
+    namespace['__setattr__'] = __setattr__
+    namespace['__doc__'] = cls.__doc__
+    namespace['__module__'] = __name__
+    namespace['__qualname__'] = f'Cached{cls.__name__}'
+    return dataclass(type(cls.__name__, (cls,), namespace))
+
+
+@dataclass
+class CacheStats:
+    """Статистика обращений к кэшу."""
+
+    hits: int           # Попадания
+    misses: int         # Промахи
+    size: int           # Текущее количество записей
+    maxsize: int        # Предельное количество записей
+    evictions: int = 0  # Вытеснено из-за нехватки места
+    expirations: int = 0  # Удалено по истечении срока жизни
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля попаданий."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@lru_cache(maxsize=None)
+def _cached_constructor(
+        workout_type: str) -> Callable[[Sequence[float]], Training]:
+    return _make_constructor(with_cached_metrics(WORKOUT_TYPES[workout_type]))
+
+
+def _read_package(workout_type: str, data: Tuple[float, ...]) -> Training:
+    if workout_type not in WORKOUT_TYPES:
+        raise ValueError(f"Такой тренировки - {workout_type}, не найдено")
+    return _cached_constructor(workout_type)(data)
+
+
+class PackageCache:
+    """
+    Ограниченный LRU-кэш объектов тренировок.
+
+    Тренировки создаются с кэшированием показателей, поэтому повторный
+    ``show_training_info()`` для того же пакета почти ничего не стоит.
+    Объекты из кэша общие для всех одинаковых пакетов - изменять их поля
+    нельзя, иначе изменится результат для следующих обращений.
+
+    Входные переменные:
+    - maxsize - наибольшее количество хранимых тренировок
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._read = lru_cache(maxsize=maxsize)(_read_package)
+
+    def read_package(self, workout_type: str,
+                     data: Sequence[float]) -> Training:
+        """То же, что ``homework.read_package``, но с кэшем."""
+        return self._read(workout_type, tuple(data))
+
+    @property
+    def stats(self) -> CacheStats:
+        info = self._read.cache_info()
+        return CacheStats(info.hits, info.misses, info.currsize,
+                          self.maxsize)
+
+    def clear(self) -> None:
+        """Очистить кэш и счётчики."""
+        self._read.cache_clear()
+
+
+class _Stripe:
+    """Сегмент кэша: свой словарь, своя блокировка, свои счётчики."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.lock = Lock()
+        # ключ -> (момент истечения, значение), от старых к новым
+        self.items: 'OrderedDict[Hashable, Tuple[float, object]]' = (
+            OrderedDict())
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+class StripedTTLCache:
+    """
+    Потокобезопасный LRU-кэш со сроком жизни записей.
+
+    Ключи распределяются по сегментам по хешу, у каждого сегмента своя
+    блокировка, поэтому потоки с разными ключами почти не ждут друг
+    друга. Вычисление значения при промахе идёт без блокировки.
+
+    Входные переменные:
+    - maxsize - общий предел записей (делится между сегментами)
+    - ttl - срок жизни записи в секундах
+    - stripes - количество сегментов (не больше ``maxsize``)
+    - clock - источник времени
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE,
+                 ttl: float = DEFAULT_TTL,
+                 stripes: int = DEFAULT_STRIPES,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        if maxsize < 1:
+            raise ValueError(
+                f"Размер кэша должен быть положительным, получено {maxsize}")
+        # сегментов не больше записей, остаток делится между первыми
+        # сегментами: в сумме пределы сегментов равны maxsize
+        stripes = max(1, min(stripes, maxsize))
+        per_stripe, remainder = divmod(maxsize, stripes)
+        self._stripes: List[_Stripe] = [
+            _Stripe(per_stripe + (index < remainder))
+            for index in range(stripes)
+        ]
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        stripe = self._stripe(key)
+        now = self.clock()
+        with stripe.lock:
+            entry = stripe.items.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    stripe.items.move_to_end(key)
+                    stripe.hits += 1
+                    return entry[1]
+                del stripe.items[key]
+                stripe.expirations += 1
+            stripe.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: object) -> None:
+        stripe = self._stripe(key)
+        expires = self.clock() + self.ttl
+        with stripe.lock:
+            stripe.items[key] = (expires, value)
+            stripe.items.move_to_end(key)
+            if len(stripe.items) > stripe.maxsize:
+                stripe.items.popitem(last=False)
+                stripe.evictions += 1
+
+    def get_or_compute(self, key: Hashable,
+                       compute: Callable[[], object]) -> object:
+        """Значение из кэша либо ``compute()``, сохранённое в кэш."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.items.clear()
+                stripe.hits = stripe.misses = 0
+                stripe.evictions = stripe.expirations = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        totals = [0, 0, 0, 0, 0]
+        for stripe in self._stripes:
+            with stripe.lock:
+                values = (stripe.hits, stripe.misses, len(stripe.items),
+                          stripe.evictions, stripe.expirations)
+            totals = [total + value for total, value in zip(totals, values)]
+        hits, misses, size, evictions, expirations = totals
+        return CacheStats(hits, misses, size, self.maxsize,
+                          evictions, expirations)
+
+
+class MessageCache:
+    """
+    Кэш строк ``read_package(...).show_training_info().get_message()``.
+
+    Входные переменные - как у ``StripedTTLCache``.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE,
+                 ttl: float = DEFAULT_TTL,
+                 stripes: int = DEFAULT_STRIPES,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._cache = StripedTTLCache(maxsize, ttl, stripes, clock)
+
+    def get_message(self, workout_type: str,
+                    data: Sequence[float]) -> str:
+        """Строка сообщения о тренировке, из кэша или вычисленная."""
+        return self._cache.get_or_compute(
+            (workout_type, tuple(data)),
+            lambda: read_package(workout_type, data)
+            .show_training_info().get_message()
+        )
+
+    def warm_up(self, path: str, fmt: Optional[str] = None) -> int:
+        """
+        Заполнить кэш пакетами из файла (csv или json lines).
+        Возвращает количество прочитанных пакетов.
+        """
+        from stream import guess_format, read_records
+
+        count = 0
+        with open(path, encoding='utf-8', newline='') as source:
+            for workout_type, data in read_records(
+                    source, fmt or guess_format(path)):
+                self._cache.set(
+                    (workout_type, tuple(data)),
+                    read_package(workout_type, data)
+                    .show_training_info().get_message())
+                count += 1
+        return count
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def clear(self) -> None:
+        self._cache.clear()
@@ -0,0 +1,136 @@
+"""
+Лёгкая точка входа командной строки для коротких вызовов.
+
+Модуль импортирует только ``sys`` и (при обработке) ``homework``; всё
+остальное (json, NumPy, asyncio и т.п.) подгружается лишь там, где
+действительно нужно.
+В отличие от ``python homework.py`` модуль запускается через ``-m`` и
+импортирует ``homework`` как модуль, поэтому используется уже
+скомпилированный байт-код из ``__pycache__``.
+
+Примеры:
+
+    python -m cli RUN 15000 1 75 SWM 720 1 80 25 40
+    printf 'RUN,15000,1,75\\n' | python -m cli
+    printf '["RUN", [15000, 1, 75]]\\n' | python -m cli
+
+Без аргументов пакеты читаются из стандартного ввода построчно: строки,
+начинающиеся с ``[`` или ``{``, разбираются как json, остальные - как
+значения через запятую. Ошибочные пакеты печатаются в stderr, код
+возврата в этом случае - 1.
+"""
+import sys
+
+
+def _number(value: str):
+    """Преобразовать строку в int, а если не получится - во float."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _is_number(value: str) -> bool:
+    try:
+        _number(value)
+    except ValueError:
+        return False
+    return True
+
+
+def packages_from_args(args):
+    """Разобрать ``КОД число число ... КОД число ...`` в пакеты."""
+    workout_type, data = None, []
+    for arg in args:
+        if _is_number(arg):
+            if workout_type is None:
+                raise ValueError(f"Значение {arg} без кода тренировки")
+            data.append(_number(arg))
+            continue
+        if workout_type is not None:
+            yield workout_type, data
+        workout_type, data = arg, []
+    if workout_type is not None:
+        yield workout_type, data
+
+
+def parse_line(line: str):
+    """
+    Разобрать одну строку csv или json в пакет.
+    Пустая строка даёт ``None``, ошибочная - ``ValueError``.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line[0] not in '[{':
+        code, *values = line.split(',')
+        return code.strip(), [_number(value) for value in values]
+    import json
+
+    try:
+        item = json.loads(line)
+        if isinstance(item, dict):
+            return item['workout_type'], item['data']
+        return item[0], item[1]
+    except (KeyError, IndexError, TypeError, RecursionError):
+        raise ValueError(f"Неверная запись пакета: {line}") from None
+
+
+def packages_from_lines(lines, on_error=None):
+    """
+    Лениво разобрать строки csv или json lines в пакеты.
+
+    Если задан ``on_error``, ошибочная строка передаётся в
+    ``on_error(строка, ошибка)`` и разбор продолжается со следующей;
+    иначе ``ValueError`` прерывает разбор.
+    """
+    for line in lines:
+        try:
+            package = parse_line(line)
+        except ValueError as error:
+            if on_error is None:
+                raise
+            on_error(line, error)
+            continue
+        if package is not None:
+            yield package
+
+
+def main(argv=None) -> int:
+    """Обработать пакеты и вернуть код завершения."""
+    # разбор пакетов используется и клиентом демона, которому homework
+    # не нужен, поэтому модуль импортируется только здесь
+    from homework import read_package
+
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] in ('-h', '--help'):
+        sys.stdout.write(__doc__)
+        return 0
+    write = sys.stdout.write
+    status = 0
+
+    def report(line, error):
+        nonlocal status
+        sys.stderr.write(f'{line.strip()}: {error}\n')
+        status = 1
+
+    if args:
+        try:
+            packages = list(packages_from_args(args))
+        except ValueError as error:
+            sys.stderr.write(f'{error}\n')
+            return 1
+    else:
+        packages = packages_from_lines(sys.stdin, report)
+    for workout_type, data in packages:
+        try:
+            training = read_package(workout_type, data)
+            write(training.show_training_info().get_message() + '\n')
+        except (ValueError, TypeError, ArithmeticError) as error:
+            sys.stderr.write(f'{workout_type} {data}: {error}\n')
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
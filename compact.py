@@ -0,0 +1,154 @@
+"""
+Компактные представления тренировок и сообщений.
+
+- ``slotted()`` строит вариант датакласса со ``__slots__`` вместо
+  ``__dict__`` у каждого экземпляра;
+- ``TrainingTable`` хранит много тренировок одного вида по столбцам в
+  непрерывных массивах ``array`` и создаёт ``InfoMessage`` по запросу.
+"""
+import math
+from array import array
+from dataclasses import dataclass, fields
+from typing import (ClassVar, Dict, Iterable, Iterator, Sequence, Tuple,
+                    Type)
+
+from homework import (InfoMessage, Running, SportsWalking, Swimming,
+                      Training)
+
+# служебные атрибуты, которые dataclass создаст заново
+_SKIP = frozenset({'__dict__', '__weakref__', '__dataclass_fields__',
+                   '__dataclass_params__', '__init__', '__repr__', '__eq__',
+                   '__hash__', '__match_args__', '__annotations__'})
+
+
+def slotted(cls: type, shared: Tuple[str, ...] = ()) -> type:
+    """
+    Создать вариант датакласса ``cls`` со ``__slots__``.
+
+    Методы и ClassVar-константы всей иерархии копируются в новый класс,
+    поэтому наследования от ``cls`` нет, а имя класса (``__name__``)
+    совпадает с исходным - сообщения о тренировке не меняются.
+    Поля из ``shared`` становятся общими атрибутами класса вместо полей
+    экземпляра.
+    """
+    namespace: Dict[str, object] = {}
+    for base in reversed(cls.__mro__[:-1]):
+        namespace.update((key, value) for key, value in vars(base).items()
+                         if key not in _SKIP)
+
+    annotations: Dict[str, object] = {}
+    slots = []
+    for field in fields(cls):
+        if field.name in shared:
+            namespace[field.name] = field.default
+            annotations[field.name] = ClassVar[field.type]
+        else:
+            namespace.pop(field.name, None)
+            annotations[field.name] = field.type
+            slots.append(field.name)
+    namespace['__annotations__'] = annotations
+    namespace['__slots__'] = tuple(slots)
+    namespace['__module__'] = __name__
+    namespace['__qualname__'] = f'Slotted{cls.__name__}'
+    return dataclass(type(cls.__name__, (), namespace))
+
+
+SlottedInfoMessage = slotted(InfoMessage, shared=('message',))
+SlottedRunning = slotted(Running)
+SlottedSportsWalking = slotted(SportsWalking)
+SlottedSwimming = slotted(Swimming)
+
+# typecode массива для типа поля
+_TYPECODES = {int: 'q', float: 'd'}
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class TrainingTable:
+    """
+    Столбцовое хранилище тренировок одного вида.
+
+    Каждое поле тренировки хранится в отдельном массиве ``array``:
+    целые поля - в 'q', вещественные - в 'd'. Объекты тренировок и
+    сообщения создаются только при обращении к ним.
+
+    Входные переменные:
+    - training_cls - класс тренировки (Running, SportsWalking, ...)
+    - rows - необязательные строки данных, как в пакете датчиков
+    """
+
+    def __init__(self,
+                 training_cls: Type[Training],
+                 rows: Iterable[Sequence[float]] = ()) -> None:
+        self.training_cls = training_cls
+        self.field_names = tuple(field.name
+                                 for field in fields(training_cls))
+        self._columns = {
+            field.name: array(_TYPECODES.get(field.type, 'd'))
+            for field in fields(training_cls)
+        }
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return len(self._columns[self.field_names[0]])
+
+    def append(self, data: Sequence[float]) -> None:
+        """Добавить одну тренировку по данным пакета."""
+        if len(data) != len(self.field_names):
+            raise TypeError(
+                f"{self.training_cls.__name__} ожидает "
+                f"{len(self.field_names)} значений, получено {len(data)}"
+            )
+        # все значения приводятся к типу столбца до изменения столбцов
+        values = [self._convert(name, value)
+                  for name, value in zip(self.field_names, data)]
+        for name, value in zip(self.field_names, values):
+            self._columns[name].append(value)
+
+    def _convert(self, name: str, value: float) -> float:
+        """Привести значение к типу столбца или вызвать ``TypeError``."""
+        try:
+            if isinstance(value, (str, bytes)):
+                raise TypeError
+            number = float(value)
+        except (TypeError, ValueError, OverflowError):
+            raise TypeError(
+                f"{name} должно быть числом, получено {value!r}") from None
+        if self._columns[name].typecode != 'q':
+            return number
+        # целые значения из JSON, CSV и NumPy часто приходят как float
+        # (720.0): принимаем их, если дробной части нет
+        if not math.isfinite(number) or number != int(number):
+            raise TypeError(f"{name} должно быть целым, получено {value}")
+        integer = int(value) if isinstance(value, int) else int(number)
+        if not _INT64_MIN <= integer <= _INT64_MAX:
+            raise TypeError(
+                f"{name} не помещается в 64-битное целое: {value}")
+        return integer
+
+    def extend(self, rows: Iterable[Sequence[float]]) -> None:
+        """Добавить несколько тренировок."""
+        for data in rows:
+            self.append(data)
+
+    def columns(self) -> Dict[str, array]:
+        """
+        Столбцы таблицы.
+        Подходят для ``batch.compute_batch`` без копирования в списки.
+        """
+        return dict(self._columns)
+
+    def row(self, index: int) -> Tuple[float, ...]:
+        """Данные одной тренировки."""
+        return tuple(self._columns[name][index] for name in self.field_names)
+
+    def __getitem__(self, index: int) -> Training:
+        return self.training_cls(*self.row(index))
+
+    def __iter__(self) -> Iterator[Training]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def info_messages(self) -> Iterator[InfoMessage]:
+        """Лениво получать ``InfoMessage`` для каждой тренировки."""
+        for training in self:
+            yield training.show_training_info()
@@ -0,0 +1,182 @@
+"""
+Долгоживущий локальный процесс-обработчик и тонкий клиент к нему.
+
+Демон держит загруженными классы тренировок и принимает пакеты через
+Unix-сокет (на основе ``server.IngestServer``), поэтому вызывающий
+скрипт не платит за запуск интерпретатора с ``homework`` на каждый
+пакет. Клиент использует только ``socket`` и ``json``; если демон не
+запущен, пакеты обрабатываются на месте.
+
+Запуск:
+
+    python daemon.py serve [--socket ПУТЬ]
+    python daemon.py client RUN 15000 1 75
+    printf 'RUN,15000,1,75\\n' | python daemon.py client
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# столько пакетов отправляется до чтения ответов на них
+CLIENT_CHUNK = 128
+# совпадает с server.ERROR_PREFIX; server не импортируется ради скорости
+ERROR_PREFIX = 'ERROR '
+
+
+def default_socket_path() -> str:
+    """Путь к сокету демона по умолчанию."""
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base, f'tracker-{os.getuid()}.sock')
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Удалить сокет, оставшийся от завершившегося демона."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"Демон уже запущен на {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: Optional[str] = None) -> None:
+    """Запустить демон и обслуживать запросы до прерывания."""
+    import asyncio
+
+    from server import IngestServer
+
+    path = path or default_socket_path()
+    _remove_stale_socket(path)
+
+    async def run() -> None:
+        ingest = IngestServer()
+        listener = await ingest.start_unix(path)
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            await ingest.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _process_locally(packages: Sequence[Tuple[str, list]]) -> List[str]:
+    from server import process_line
+
+    return [process_line(json.dumps(package)) for package in packages]
+
+
+class DaemonClient:
+    """
+    Клиент демона с постоянным соединением.
+
+    Входные переменные:
+    - path - путь к сокету демона
+    - fallback - обрабатывать пакеты на месте, если демон недоступен
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 fallback: bool = True) -> None:
+        self.path = path or default_socket_path()
+        self.fallback = fallback
+        self._socket: Optional[socket.socket] = None
+        self._reader = None
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _connect(self) -> bool:
+        if self._socket is not None:
+            return True
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            sock.close()
+            if not self.fallback:
+                raise
+            return False
+        self._socket = sock
+        self._reader = sock.makefile('rb')
+        return True
+
+    def request(self, packages: Iterable[Tuple[str, list]]) -> List[str]:
+        """Отправить пакеты и получить строки ответов в том же порядке."""
+        packages = list(packages)
+        if not self._connect():
+            return _process_locally(packages)
+        responses = []
+        for start in range(0, len(packages), CLIENT_CHUNK):
+            chunk = packages[start:start + CLIENT_CHUNK]
+            self._socket.sendall(''.join(
+                json.dumps(package) + '\n' for package in chunk
+            ).encode('utf-8'))
+            for _ in chunk:
+                line = self._reader.readline()
+                if not line:
+                    raise ConnectionError("Демон закрыл соединение")
+                responses.append(line.decode('utf-8').rstrip('\n'))
+        return responses
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    args = sys.argv[1:] if argv is None else argv
+    path = None
+    if '--socket' in args:
+        index = args.index('--socket')
+        path = args[index + 1]
+        args = args[:index] + args[index + 2:]
+    if not args or args[0] not in ('serve', 'client'):
+        sys.stdout.write(__doc__)
+        return 2
+    if args[0] == 'serve':
+        serve(path)
+        return 0
+
+    from cli import packages_from_args, packages_from_lines
+
+    status = 0
+
+    def report(line: str, error: ValueError) -> None:
+        nonlocal status
+        sys.stderr.write(f'{ERROR_PREFIX}{line.strip()}: {error}\n')
+        status = 1
+
+    packages = (packages_from_args(args[1:]) if args[1:]
+                else packages_from_lines(sys.stdin, report))
+    with DaemonClient(path) as client:
+        for response in client.request(packages):
+            if response.startswith(ERROR_PREFIX):
+                sys.stderr.write(response + '\n')
+                status = 1
+            else:
+                sys.stdout.write(response + '\n')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Отсев повторных пакетов от устройств до вызова ``read_package``.
+
+Ключ пакета - 128-битный отпечаток ``(workout_type, data)``. Пакет
+считается повтором, если такой же пакет приходил не раньше чем
+``window_seconds`` назад.
+
+Память ограничена двумя хранилищами:
+
+- фильтр Блума помнит все отпечатки окна. Он разбит на ``generations``
+  поколений по ``window_seconds / generations`` секунд; поколение
+  удаляется, когда его последняя запись старше окна, поэтому фильтр
+  помнит пакет не меньше окна и не дольше чем на одно поколение сверх
+  него. Отрицательный ответ фильтра означает, что пакет точно новый;
+- точный индекс хранит не больше ``max_entries`` последних отпечатков
+  и подтверждает положительные ответы фильтра.
+
+Пока индекс не переполнялся, ответ точный. Если отпечатки вытеснялись
+из индекса по размеру, для них остаётся только фильтр: такой пакет
+считается повтором по положительному ответу фильтра, с вероятностью
+ложного срабатывания фильтра Блума.
+"""
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import (Callable, Deque, Iterable, Iterator, Optional, Sequence,
+                    Tuple)
+
+Package = Tuple[str, Sequence[float]]
+
+DEFAULT_WINDOW = 3600.0
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_BLOOM_BITS = 1 << 24
+DEFAULT_HASHES = 4
+DEFAULT_GENERATIONS = 4
+
+
+def fingerprint(workout_type: str, data: Sequence[float]) -> int:
+    """
+    128-битный отпечаток пакета.
+    Значения приводятся к float, поэтому 1 и 1.0 дают один отпечаток.
+    """
+    key = repr((workout_type, tuple(float(value) for value in data)))
+    return int.from_bytes(blake2b(key.encode('utf-8'),
+                                  digest_size=16).digest(), 'little')
+
+
+class BloomFilter:
+    """
+    Фильтр Блума над битовым массивом ``bytearray``.
+
+    Позиции битов получаются двойным хешированием из отпечатка:
+    ``h1 + i * h2`` для i от 0 до ``hashes - 1``.
+    """
+
+    def __init__(self, bits: int = DEFAULT_BLOOM_BITS,
+                 hashes: int = DEFAULT_HASHES) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key: int) -> Iterator[int]:
+        first, second = key & 0xFFFFFFFFFFFFFFFF, (key >> 64) | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.bits
+
+    def add(self, key: int) -> None:
+        array = self._array
+        for position in self._positions(key):
+            array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: int) -> bool:
+        array = self._array
+        return all(array[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+
+@dataclass
+class DedupStats:
+    """Статистика отсева повторов."""
+
+    total: int = 0          # Проверено пакетов
+    duplicates: int = 0     # Из них повторов
+    bloom_negatives: int = 0  # Отсечено фильтром Блума без индекса
+    bloom_duplicates: int = 0  # Повторы, найденные только фильтром
+
+    @property
+    def dedup_rate(self) -> float:
+        """Доля повторов."""
+        return self.duplicates / self.total if self.total else 0.0
+
+
+class Deduplicator:
+    """
+    Отсев повторных пакетов в скользящем окне времени.
+
+    Входные переменные:
+    - window_seconds - сколько помнить пакет
+    - max_entries - наибольший размер точного индекса
+    - bloom_bits, hashes - размер одного поколения фильтра Блума и
+      число хеш-функций
+    - generations - на сколько поколений делится окно фильтра
+    - clock - источник времени (секунды)
+    """
+
+    def __init__(self,
+                 window_seconds: float = DEFAULT_WINDOW,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 bloom_bits: int = DEFAULT_BLOOM_BITS,
+                 hashes: int = DEFAULT_HASHES,
+                 generations: int = DEFAULT_GENERATIONS,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self.bloom_bits = bloom_bits
+        self.hashes = hashes
+        self.generation_seconds = window_seconds / generations
+        self.clock = clock
+        self.stats = DedupStats()
+        # отпечаток -> время последнего появления, в порядке появления
+        self._index: 'OrderedDict[int, float]' = OrderedDict()
+        # поколения фильтра: [начало, последняя запись, фильтр]
+        self._generations: Deque[list] = deque()
+        # до этого момента в окне могут быть вытесненные из индекса ключи
+        self._overflow_until = float('-inf')
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _expire(self, now: float) -> None:
+        deadline = now - self.window_seconds
+        generations = self._generations
+        while generations and generations[0][1] <= deadline:
+            generations.popleft()
+        if (not generations
+                or now - generations[-1][0] >= self.generation_seconds):
+            generations.append(
+                [now, now, BloomFilter(self.bloom_bits, self.hashes)])
+        index = self._index
+        while index and next(iter(index.values())) <= deadline:
+            index.popitem(last=False)
+
+    def _remember(self, key: int, now: float) -> None:
+        current = self._generations[-1]
+        current[1] = max(current[1], now)
+        current[2].add(key)
+        index = self._index
+        index[key] = now
+        index.move_to_end(key)
+        if len(index) > self.max_entries:
+            _, seen = index.popitem(last=False)
+            self._overflow_until = max(self._overflow_until,
+                                       seen + self.window_seconds)
+
+    def is_duplicate(self, workout_type: str, data: Sequence[float],
+                     now: Optional[float] = None) -> bool:
+        """Проверить пакет и запомнить его."""
+        now = self.clock() if now is None else now
+        self._expire(now)
+        self.stats.total += 1
+        key = fingerprint(workout_type, data)
+        duplicate = False
+        if not any(key in bloom for _, _, bloom in self._generations):
+            self.stats.bloom_negatives += 1
+        elif key in self._index:
+            duplicate = True
+        elif now < self._overflow_until:
+            # ключ мог быть вытеснен из индекса: верим фильтру
+            duplicate = True
+            self.stats.bloom_duplicates += 1
+        self._remember(key, now)
+        if duplicate:
+            self.stats.duplicates += 1
+        return duplicate
+
+    def filter(self, packages: Iterable[Package]) -> Iterator[Package]:
+        """Пропустить дальше только впервые увиденные пакеты."""
+        for workout_type, data in packages:
+            if not self.is_duplicate(workout_type, data):
+                yield workout_type, data
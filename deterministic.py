@@ -0,0 +1,140 @@
+"""
+Детерминированный расчёт калорий: одинаковый результат до бита для
+поштучного, пакетного (NumPy) и многопроцессного расчёта.
+
+Обычные методы ``get_spent_calories`` и ``batch.compute_batch`` могут
+расходиться в последнем бите: ``x ** n`` в Python вызывает ``pow`` из
+libm, а NumPy для того же выражения использует свои реализации.
+В этом режиме:
+
+- формулы записаны один раз и вычисляются одним и тем же кодом и для
+  чисел, и для массивов, в порядке операций методов классов;
+- степень с целым показателем считается последовательным умножением
+  слева направо (``x * x * ... * x``), дробные показатели не
+  допускаются;
+- результат округляется до ``DECIMALS`` знаков после запятой: значение
+  умножается на ``10 ** DECIMALS``, округляется до целого по правилу
+  «половина к чётному» и делится обратно. Так NumPy (``rint``) и Python
+  (``round``) дают одно и то же число.
+
+Значения совпадают с обычными методами с точностью до последних битов
+(в редких случаях ``//`` у спортивной ходьбы может дать соседнее целое).
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from homework import (Running, SportsWalking, Swimming, Training,
+                      read_package)
+
+DECIMALS = 9
+SCALE = 10.0 ** DECIMALS
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def ipow(value, exponent: float):
+    """Степень с целым неотрицательным показателем через умножение."""
+    if exponent != int(exponent) or exponent < 0:
+        raise ValueError(
+            f"Детерминированный режим поддерживает только целые "
+            f"неотрицательные показатели степени, получено {exponent}"
+        )
+    result = value * 0 + 1.0
+    for _ in range(int(exponent)):
+        result = result * value
+    return result
+
+
+def round_fixed(value):
+    """Округлить число или массив до ``DECIMALS`` знаков одинаково."""
+    if hasattr(value, '__array__'):
+        import numpy as np
+
+        return np.rint(value * SCALE) / SCALE
+    if not math.isfinite(value):
+        return value
+    return round(value * SCALE) / SCALE
+
+
+# Формулы получают значения полей ``c`` (числа или массивы) и константы
+# ``k`` (класс тренировки) и повторяют порядок операций методов классов.
+
+def _running(c, k):
+    speed = c['action'] * k.LEN_STEP / k.M_IN_KM / c['duration']
+    return ((k.coeff_calorie_1 * speed
+            - k.coeff_calorie_2) * c['weight']
+            / k.M_IN_KM * c['duration'] * k.TIME_CONST)
+
+
+def _sports_walking(c, k):
+    speed = c['action'] * k.LEN_STEP / k.M_IN_KM / c['duration']
+    return ((k.coeff_calorie_1
+            * c['weight']
+            + (ipow(speed, k.coeff_calorie_3)
+                // c['height'])
+            * k.coeff_calorie_2 * c['weight'])
+            * k.TIME_CONST * c['duration'])
+
+
+def _swimming(c, k):
+    speed = (c['length_pool'] * c['count_pool']
+             / k.M_IN_KM / c['duration'])
+    return ((speed + k.coeff_calorie_1)
+            * k.coeff_calorie_2 * c['weight'])
+
+
+# формулы по имени класса: так их находят и компактные варианты классов
+# (compact.SlottedRunning и другие), у которых то же ``__name__``
+FORMULAS: Dict[str, Callable] = {
+    Running.__name__: _running,
+    SportsWalking.__name__: _sports_walking,
+    Swimming.__name__: _swimming,
+}
+
+
+def _formula(cls: type) -> Callable:
+    for base in cls.__mro__:
+        if base.__name__ in FORMULAS:
+            return FORMULAS[base.__name__]
+    raise ValueError(
+        f"Нет детерминированной формулы для {cls.__name__}")
+
+
+def spent_calories(training: Training) -> float:
+    """Детерминированные калории одной тренировки."""
+    cls = type(training)
+    values = {field.name: getattr(training, field.name)
+              for field in fields(training)}
+    return round_fixed(_formula(cls)(values, cls))
+
+
+def spent_calories_batch(workout_type: str, columns):
+    """Детерминированные калории для столбцов ``batch.compute_batch``."""
+    import numpy as np
+
+    from batch import BATCH_WORKOUTS, column_arrays
+
+    arrays = column_arrays(workout_type, columns)
+    cls = BATCH_WORKOUTS[workout_type][0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return round_fixed(_formula(cls)(arrays, cls))
+
+
+def _calories_chunk(packages: List[Tuple[str, Sequence[float]]]
+                    ) -> List[float]:
+    return [spent_calories(read_package(workout_type, data))
+            for workout_type, data in packages]
+
+
+def spent_calories_parallel(packages: Iterable[Tuple[str, Sequence[float]]],
+                            workers: Optional[int] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE
+                            ) -> List[float]:
+    """Детерминированные калории на пуле процессов, в порядке пакетов."""
+    packages = list(packages)
+    chunks = [packages[start:start + chunk_size]
+              for start in range(0, len(packages), chunk_size)]
+    with ProcessPoolExecutor(workers) as executor:
+        return [calories for chunk in executor.map(_calories_chunk, chunks)
+                for calories in chunk]
@@ -1,5 +1,60 @@
-from dataclasses import dataclass, asdict
-from typing import Dict, Type, ClassVar
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from io import StringIO
+from typing import (Callable, Dict, Iterable, Iterator, Optional, Sequence,
+                    TextIO, Tuple, Type, ClassVar)
+
+
+# преобразования ``!r``, ``!s`` и ``!a`` в шаблонах ``str.format``
+CONVERSIONS: Dict[str, Callable[[object], str]] = {
+    'r': repr, 's': str, 'a': ascii,
+}
+TEMPLATE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> Callable[[object], str]:
+    """
+    Скомпилировать шаблон ``str.format`` в функцию от объекта.
+
+    Шаблон разбирается один раз на части: текст, функция чтения поля,
+    преобразование и спецификация формата. При выводе значения полей
+    читаются напрямую из атрибутов объекта. Результат совпадает с
+    ``template.format(**поля_объекта)``.
+    """
+    # модули нужны только здесь: не тратим на них время запуска
+    from operator import attrgetter
+    from string import Formatter
+
+    def format_fields(obj: object) -> str:
+        return template.format_map(
+            {name: getattr(obj, name) for name in obj.__annotations__}
+        )
+
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if field is None:
+            parts.append((literal, None, None, ''))
+            continue
+        if not field.isidentifier() or '{' in spec:
+            # поля вида {a[0]}, {a.b} и вложенные спецификации
+            # форматируем как есть
+            return format_fields
+        parts.append((literal, attrgetter(field),
+                      CONVERSIONS.get(conversion), spec))
+
+    def render(obj: object) -> str:
+        result = []
+        for literal, getter, convert, spec in parts:
+            result.append(literal)
+            if getter is not None:
+                value = getter(obj)
+                if convert is not None:
+                    value = convert(value)
+                result.append(format(value, spec))
+        return ''.join(result)
+
+    return render
 
 
 @dataclass
@@ -24,7 +79,23 @@ class InfoMessage:
     # format specifier (.3f)
     def get_message(self) -> str:
         """Метод возвращает строку сообщения"""
-        return self.message.format(**asdict(self))
+        return compile_template(self.message)(self)
+
+
+def render_many(messages: Iterable[InfoMessage],
+                out: Optional[TextIO] = None) -> Optional[str]:
+    """
+    Отрисовать много сообщений подряд, по одному на строку.
+
+    Если ``out`` не передан, возвращает собранную строку, иначе пишет
+    в ``out`` и возвращает ``None``.
+    """
+    buffer = StringIO() if out is None else out
+    write = buffer.write
+    for info in messages:
+        write(compile_template(info.message)(info))
+        write('\n')
+    return buffer.getvalue() if out is None else None
 
 
 @dataclass
@@ -85,6 +156,55 @@ class Training:
                            )
 
 
+# код тренировки -> класс обработчик тренировки
+WORKOUT_TYPES: Dict[str, Type[Training]] = {}
+# код тренировки -> конструктор с заранее известным числом параметров
+_CONSTRUCTORS: Dict[str, Callable[[Sequence[float]], Training]] = {}
+
+
+def _make_constructor(
+        cls: Type[Training]) -> Callable[[Iterable[float]], Training]:
+    """Создать конструктор, проверяющий количество данных пакета."""
+    arity = len(fields(cls))
+
+    def construct(data: Iterable[float]) -> Training:
+        data = tuple(data)
+        if len(data) != arity:
+            raise TypeError(
+                f"{cls.__name__} ожидает {arity} значений, "
+                f"получено {len(data)}"
+            )
+        return cls(*data)
+
+    return construct
+
+
+def register_workout(
+        workout_type: str) -> Callable[[Type[Training]], Type[Training]]:
+    """
+    Декоратор: зарегистрировать класс тренировки под кодом пакета.
+
+    Применяется поверх ``@dataclass``, чтобы поля класса были известны:
+
+        @register_workout('RUN')
+        @dataclass
+        class Running(Training):
+            ...
+    """
+    def decorator(cls: Type[Training]) -> Type[Training]:
+        if workout_type in WORKOUT_TYPES:
+            raise ValueError(
+                f"Код тренировки {workout_type} уже занят классом "
+                f"{WORKOUT_TYPES[workout_type].__name__}"
+            )
+        WORKOUT_TYPES[workout_type] = cls
+        _CONSTRUCTORS[workout_type] = _make_constructor(cls)
+        return cls
+
+    return decorator
+
+
+@register_workout('RUN')
 @dataclass
 class Running(Training):
     """Тренировка: бег."""
@@ -99,6 +219,7 @@ class Running(Training):
                 / self.M_IN_KM * self.duration * self.TIME_CONST)
 
 
+@register_workout('WLK')
 @dataclass
 class SportsWalking(Training):
     """
@@ -125,6 +246,7 @@ class SportsWalking(Training):
                 * self.TIME_CONST * self.duration)
 
 
+@register_workout('SWM')
 @dataclass
 class Swimming(Training):
     """
@@ -175,16 +297,27 @@ def read_package(workout_type: str, data: list) -> Training:
 
     Возвращает:
     - Объект класса тренировки
-    """
-    workout: Dict[str, Type[Training]] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking
-    }
 
-    if workout_type not in workout:
-        raise ValueError(f"Такой тренировки - {workout_type}, не найдено")
-    return workout[workout_type](*data)
+    Коды тренировок берутся из реестра ``WORKOUT_TYPES``, новые виды
+    добавляются декоратором ``register_workout``.
+    """
+    try:
+        construct = _CONSTRUCTORS[workout_type]
+    except KeyError:
+        raise ValueError(
+            f"Такой тренировки - {workout_type}, не найдено") from None
+    return construct(data)
+
+
+def read_packages(
+        packages: Iterable[Tuple[str, Sequence[float]]]) -> Iterator[Training]:
+    """Лениво прочитать поток пакетов ``(workout_type, data)``."""
+    constructors = _CONSTRUCTORS
+    for workout_type, data in packages:
+        if workout_type not in constructors:
+            raise ValueError(
+                f"Такой тренировки - {workout_type}, не найдено")
+        yield constructors[workout_type](data)
 
 
 def main(training: Training) -> None:
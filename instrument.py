@@ -0,0 +1,224 @@
+"""
+Замеры горячих участков в работающей системе.
+
+Инструментирование включается явно: ``enable()`` подменяет
+конструкторы ``read_package`` и методы ``get_spent_calories``,
+``show_training_info`` и ``InfoMessage.get_message`` обёртками со
+счётчиками, а ``disable()`` возвращает исходные функции. В выключенном
+состоянии обёрток нет, и накладные расходы равны нулю.
+
+Для каждой пары (вид тренировки, метод) собираются количество вызовов,
+суммарное время и перцентили задержки по последним ``SAMPLE_SIZE``
+вызовам. Снимок доступен словарём (``snapshot()``) и в текстовом
+формате Prometheus (``to_prometheus()``).
+"""
+import cProfile
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import (Callable, Deque, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple)
+
+import homework
+
+SAMPLE_SIZE = 1024
+PERCENTILES = (50, 95, 99)
+METHODS = ('get_spent_calories', 'show_training_info')
+
+
+class MethodStats:
+    """Счётчики одного метода одного вида тренировки."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Перцентиль задержки по последним вызовам (в секундах)."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def as_dict(self) -> Dict[str, float]:
+        result = {'count': self.count, 'total': self.total}
+        for percent in PERCENTILES:
+            result[f'p{percent}'] = self.percentile(percent)
+        return result
+
+
+class Instrumentation:
+    """Подмена горячих методов обёртками со счётчиками."""
+
+    def __init__(self) -> None:
+        self.stats: Dict[Tuple[str, str], MethodStats] = {}
+        self.enabled = False
+        self._restore: List[Callable[[], None]] = []
+
+    def _record(self, training_type: str, method: str,
+                seconds: float) -> None:
+        key = (training_type, method)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = MethodStats()
+        stats.add(seconds)
+
+    def _wrap_method(self, cls: type, name: str,
+                     label: Callable[[object], str]) -> None:
+        original = cls.__dict__[name]
+        record = self._record
+        clock = time.perf_counter
+
+        @wraps(original)
+        def wrapper(obj, *args, **kwargs):
+            start = clock()
+            try:
+                return original(obj, *args, **kwargs)
+            finally:
+                record(label(obj), name, clock() - start)
+
+        setattr(cls, name, wrapper)
+        self._restore.append(lambda: setattr(cls, name, original))
+
+    def _wrap_constructor(self, workout_type: str) -> None:
+        constructors = homework._CONSTRUCTORS
+        original = constructors[workout_type]
+        training_type = homework.WORKOUT_TYPES[workout_type].__name__
+        record = self._record
+        clock = time.perf_counter
+
+        def construct(data):
+            start = clock()
+            try:
+                return original(data)
+            finally:
+                record(training_type, 'read_package', clock() - start)
+
+        constructors[workout_type] = construct
+        self._restore.append(
+            lambda: constructors.__setitem__(workout_type, original))
+
+    def enable(self) -> None:
+        """
+        Установить обёртки. Повторный вызов ничего не делает.
+
+        Метод оборачивается один раз в классе, где он определён: обёртка
+        берёт название тренировки из ``type(obj)``, поэтому наследники
+        (например, ``Cycling(Running)``) считаются под своим именем и
+        без двойного учёта.
+        """
+        if self.enabled:
+            return
+        owners = []
+        for workout_type, cls in homework.WORKOUT_TYPES.items():
+            self._wrap_constructor(workout_type)
+            for name in METHODS:
+                owner = next(base for base in cls.__mro__
+                             if name in base.__dict__)
+                if (owner, name) not in owners:
+                    owners.append((owner, name))
+        for owner, name in owners:
+            self._wrap_method(owner, name, lambda obj: type(obj).__name__)
+        self._wrap_method(homework.InfoMessage, 'get_message',
+                          lambda info: info.training_type)
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Вернуть исходные методы; накопленные счётчики сохраняются."""
+        while self._restore:
+            self._restore.pop()()
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Обнулить счётчики."""
+        self.stats.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Счётчики в виде ``{вид тренировки: {метод: {...}}}``."""
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (training_type, method), stats in sorted(self.stats.items()):
+            result.setdefault(training_type, {})[method] = stats.as_dict()
+        return result
+
+    def to_prometheus(self, prefix: str = 'tracker') -> str:
+        """Счётчики в текстовом формате Prometheus."""
+        lines = [
+            f'# TYPE {prefix}_calls_total counter',
+            f'# TYPE {prefix}_seconds_total counter',
+            f'# TYPE {prefix}_latency_seconds summary',
+        ]
+        for (training_type, method), stats in sorted(self.stats.items()):
+            labels = f'training_type="{training_type}",method="{method}"'
+            lines.append(f'{prefix}_calls_total{{{labels}}} {stats.count}')
+            lines.append(
+                f'{prefix}_seconds_total{{{labels}}} {stats.total!r}')
+            for percent in PERCENTILES:
+                lines.append(
+                    f'{prefix}_latency_seconds{{{labels},'
+                    f'quantile="{percent / 100}"}} '
+                    f'{stats.percentile(percent)!r}'
+                )
+            lines.append(
+                f'{prefix}_latency_seconds_sum{{{labels}}} {stats.total!r}')
+            lines.append(
+                f'{prefix}_latency_seconds_count{{{labels}}} {stats.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str, prefix: str = 'tracker') -> None:
+        """Записать счётчики в файл для textfile-коллектора Prometheus."""
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(self.to_prometheus(prefix))
+
+
+instrumentation = Instrumentation()
+enable = instrumentation.enable
+disable = instrumentation.disable
+reset = instrumentation.reset
+snapshot = instrumentation.snapshot
+to_prometheus = instrumentation.to_prometheus
+
+
+@contextmanager
+def instrumented() -> Iterator[Instrumentation]:
+    """Включить инструментирование на время блока ``with``."""
+    was_enabled = instrumentation.enabled
+    instrumentation.enable()
+    try:
+        yield instrumentation
+    finally:
+        if not was_enabled:
+            instrumentation.disable()
+
+
+@contextmanager
+def profiled(output: Optional[str] = None) -> Iterator[cProfile.Profile]:
+    """
+    Профилировать блок ``with`` через ``cProfile``.
+    Если задан ``output``, результат сохраняется в файл для ``pstats``.
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        if output is not None:
+            profile.dump_stats(output)
+
+
+def profile_packages(packages: Iterable[Tuple[str, Sequence[float]]],
+                     output: Optional[str] = None) -> pstats.Stats:
+    """Профилировать полную обработку набора пакетов."""
+    with profiled(output) as profile:
+        for training in homework.read_packages(packages):
+            training.show_training_info().get_message()
+    return pstats.Stats(profile)
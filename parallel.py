@@ -0,0 +1,130 @@
+"""
+Параллельная обработка пакетов на нескольких ядрах.
+
+Поток пакетов разбивается на порции, которые отправляются в
+``ProcessPoolExecutor``. Между процессами передаются только сами пакеты
+и готовые строки сообщений - объекты ``Training`` и ``InfoMessage``
+создаются внутри рабочих процессов и не сериализуются.
+
+Запуск: ``python parallel.py [файл] [--workers N] [--unordered]``.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from stream import (DEFAULT_CHUNK_SIZE, FORMATS, Record, chunked,
+                    guess_format, iter_messages, read_records)
+
+
+@dataclass
+class ParallelStats:
+    """Статистика параллельного прогона."""
+
+    records: int = 0        # Количество обработанных пакетов
+    chunks: int = 0         # Количество порций
+    seconds: float = 0.0    # Время работы
+
+    @property
+    def throughput(self) -> float:
+        """Пакетов в секунду."""
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+def _process_chunk(chunk: List[Record]) -> List[str]:
+    """Обработать порцию пакетов в рабочем процессе."""
+    return list(iter_messages(chunk))
+
+
+class ParallelRunner:
+    """
+    Обработчик пакетов на пуле процессов.
+
+    Входные переменные:
+    - workers - количество процессов (по умолчанию - число ядер)
+    - chunk_size - количество пакетов в одной порции
+    - ordered - сохранять ли порядок входных пакетов
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 ordered: bool = True) -> None:
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        self.stats = ParallelStats()
+
+    def run(self, records: Iterable[Record]) -> Iterator[str]:
+        """
+        Лениво получать сообщения для потока пакетов.
+
+        Одновременно в работе держится не больше двух порций на процесс,
+        поэтому память не зависит от размера входа.
+        """
+        self.stats = ParallelStats()
+        start = time.perf_counter()
+        workers = self.workers or os.cpu_count() or 1
+        max_pending = 2 * workers
+        with ProcessPoolExecutor(workers) as executor:
+            pending: deque = deque()
+            for chunk in chunked(records, self.chunk_size):
+                pending.append(executor.submit(_process_chunk, chunk))
+                self.stats.chunks += 1
+                if len(pending) >= max_pending:
+                    yield from self._drain(pending)
+            while pending:
+                yield from self._drain(pending)
+        self.stats.seconds = time.perf_counter() - start
+
+    def _drain(self, pending: deque) -> Iterator[str]:
+        """Выдать результаты готовых порций."""
+        if self.ordered:
+            messages = pending.popleft().result()
+            self.stats.records += len(messages)
+            yield from messages
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            messages = future.result()
+            self.stats.records += len(messages)
+            yield from messages
+
+
+def main(argv: Optional[List[str]] = None) -> ParallelStats:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('path', nargs='?', default='-',
+                        help='файл с пакетами, "-" - стандартный ввод')
+    parser.add_argument('--format', choices=FORMATS, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int,
+                        default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--unordered', action='store_true')
+    args = parser.parse_args(argv)
+
+    runner = ParallelRunner(args.workers, args.chunk_size,
+                            not args.unordered)
+    fmt = args.format or guess_format(args.path)
+    source = (sys.stdin if args.path == '-'
+              else open(args.path, encoding='utf-8', newline=''))
+    try:
+        for chunk in chunked(runner.run(read_records(source, fmt)),
+                             args.chunk_size):
+            sys.stdout.write('\n'.join(chunk) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    stats = runner.stats
+    print(f'{stats.records} пакетов за {stats.seconds:.3f} с '
+          f'({stats.throughput:.0f} пакетов/с)', file=sys.stderr)
+    return stats
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""
+Asyncio-сервер приёма пакетов от датчиков в реальном времени.
+
+Протокол построчный: клиент присылает записи в формате json lines
+(см. ``stream.read_jsonl``), сервер на каждую запись отвечает строкой
+сообщения ``InfoMessage.get_message()`` либо строкой ``ERROR <текст>``.
+Ответы идут в порядке запросов одного соединения.
+
+Записи всех соединений собираются в общую очередь и обрабатываются
+порциями (микро-батчами). Очереди ограничены, поэтому медленный клиент
+или перегрузка приостанавливают чтение из сокета - работает обратное
+давление TCP.
+
+Запуск: ``python server.py --port 8765`` или ``python server.py --unix
+/tmp/tracker.sock``.
+"""
+import argparse
+import asyncio
+import json
+from typing import Iterable, List, Optional, Tuple
+
+from homework import read_package
+from stream import read_jsonl
+
+ERROR_PREFIX = 'ERROR '
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_QUEUE = 4096
+DEFAULT_MAX_PENDING = 256
+# наибольшая длина строки запроса в байтах
+DEFAULT_LINE_LIMIT = 64 * 1024
+
+
+class LineError(str):
+    """Ответ ``ERROR`` на строку запроса, которую не удалось прочитать."""
+
+
+def process_line(line: str) -> str:
+    """Обработать одну строку запроса и вернуть строку ответа."""
+    try:
+        for workout_type, data in read_jsonl([line]):
+            training = read_package(workout_type, data)
+            return training.show_training_info().get_message()
+        return ERROR_PREFIX + 'пустая запись'
+    except Exception as error:
+        # любая ошибка записи (в том числе OverflowError и RecursionError)
+        # становится ответом, иначе она остановит общий обработчик
+        return ERROR_PREFIX + f'{type(error).__name__}: {error}'
+
+
+class IngestServer:
+    """
+    Сервер приёма пакетов.
+
+    Входные переменные:
+    - max_batch - наибольший размер микро-батча
+    - max_queue - размер общей очереди записей всех соединений
+    - max_pending - сколько ответов одного соединения может ждать записи
+    - line_limit - наибольшая длина строки запроса в байтах; на более
+      длинную строку приходит ответ ``ERROR``
+    """
+
+    def __init__(self,
+                 max_batch: int = DEFAULT_MAX_BATCH,
+                 max_queue: int = DEFAULT_MAX_QUEUE,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 line_limit: int = DEFAULT_LINE_LIMIT) -> None:
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.max_pending = max_pending
+        self.line_limit = line_limit
+        self.batches = 0
+        self.records = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._servers: List[asyncio.AbstractServer] = []
+
+    def _ensure_batcher(self) -> None:
+        if self._batcher is None:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._batcher = asyncio.ensure_future(self._run_batcher())
+
+    async def start_tcp(self, host: str = '127.0.0.1',
+                        port: int = 0) -> asyncio.AbstractServer:
+        """Начать приём соединений по TCP."""
+        self._ensure_batcher()
+        server = await asyncio.start_server(self._handle, host, port,
+                                            limit=self.line_limit)
+        self._servers.append(server)
+        return server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Начать приём соединений через Unix-сокет."""
+        self._ensure_batcher()
+        server = await asyncio.start_unix_server(self._handle, path,
+                                                 limit=self.line_limit)
+        self._servers.append(server)
+        return server
+
+    async def close(self) -> None:
+        """Остановить приём соединений и обработку."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+    async def _run_batcher(self) -> None:
+        """Забирать записи из очереди порциями и обрабатывать их."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            for line, future in batch:
+                if not future.done():
+                    future.set_result(process_line(line))
+            self.batches += 1
+            self.records += len(batch)
+            # дать соединениям записать ответы и прочитать новые записи
+            await asyncio.sleep(0)
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        pending: asyncio.Queue = asyncio.Queue(self.max_pending)
+        responder = asyncio.ensure_future(self._respond(pending, writer))
+        try:
+            while True:
+                line = await self._read_line(reader)
+                if line is None:
+                    break
+                if isinstance(line, LineError):
+                    # строку не удалось прочитать: ответ готов сразу
+                    future = loop.create_future()
+                    future.set_result(line)
+                    await pending.put(future)
+                    continue
+                if not line.strip():
+                    continue
+                future = loop.create_future()
+                await pending.put(future)
+                await self._queue.put((line, future))
+        except ConnectionError:
+            pass
+        finally:
+            await pending.put(None)
+            try:
+                await responder
+            except ConnectionError:
+                # клиент отключился, не дождавшись ответов
+                pass
+            writer.close()
+
+    @staticmethod
+    async def _skip_line(reader: asyncio.StreamReader) -> None:
+        """Пропустить остаток слишком длинной строки до перевода строки."""
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.IncompleteReadError:
+                return
+            except asyncio.LimitOverrunError as error:
+                await reader.readexactly(error.consumed)
+
+    async def _read_line(self,
+                         reader: asyncio.StreamReader) -> Optional[str]:
+        """
+        Прочитать строку запроса; ``None`` - конец потока.
+        Вместо слишком длинной строки или строки не в UTF-8 возвращается
+        ``LineError`` с готовым ответом ``ERROR ...``.
+        """
+        try:
+            raw = await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as error:
+            # последняя строка без перевода строки
+            raw = error.partial
+            if not raw:
+                return None
+        except asyncio.LimitOverrunError:
+            await self._skip_line(reader)
+            return LineError(
+                ERROR_PREFIX + f'строка длиннее {self.line_limit} байт')
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError as error:
+            return LineError(ERROR_PREFIX + f'UnicodeDecodeError: {error}')
+
+    @staticmethod
+    async def _respond(pending: asyncio.Queue,
+                       writer: asyncio.StreamWriter) -> None:
+        """Писать ответы соединения в порядке запросов."""
+        while True:
+            future = await pending.get()
+            if future is None:
+                break
+            writer.write((await future + '\n').encode('utf-8'))
+            if pending.empty():
+                await writer.drain()
+        await writer.drain()
+
+
+async def send_packages(packages: Iterable[Tuple[str, list]],
+                        host: str = '127.0.0.1',
+                        port: Optional[int] = None,
+                        path: Optional[str] = None) -> List[str]:
+    """
+    Простой клиент: отправить пакеты и получить ответы сервера.
+    Подключается к Unix-сокету ``path`` либо к ``host:port``.
+    """
+    lines = [(json.dumps(package) + '\n').encode('utf-8')
+             for package in packages]
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    async def read_responses() -> List[str]:
+        return [(await reader.readline()).decode('utf-8').rstrip('\n')
+                for _ in lines]
+
+    # ответы читаются параллельно с отправкой, иначе при большом числе
+    # пакетов обе стороны упрутся в заполненные буферы сокета
+    responses = asyncio.ensure_future(read_responses())
+    for line in lines:
+        writer.write(line)
+        await writer.drain()
+    writer.write_eof()
+    result = await responses
+    writer.close()
+    await writer.wait_closed()
+    return result
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = IngestServer(args.max_batch)
+    if args.unix:
+        listener = await server.start_unix(args.unix)
+    else:
+        listener = await server.start_tcp(args.host, args.port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None,
+                        help='путь к Unix-сокету вместо TCP')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
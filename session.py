@@ -0,0 +1,119 @@
+"""
+Инкрементальный учёт тренировки по потоку обновлений от датчиков.
+
+Устройство присылает приращения каждые несколько секунд: новые шаги
+или гребки, прошедшее время, новые проплытые бассейны. ``TrainingSession``
+хранит один объект тренировки и прибавляет приращения к его полям, а
+дистанция, скорость и калории считаются методами того же класса - за
+O(1) на обновление, без создания новых объектов.
+"""
+from dataclasses import fields
+from typing import Dict
+
+from homework import WORKOUT_TYPES, InfoMessage, Training
+
+# поля, которые накапливаются за тренировку
+ACCUMULATED = ('action', 'duration', 'count_pool')
+
+
+class TrainingSession:
+    """
+    Тренировка, которая обновляется по ходу выполнения.
+
+    Входные переменные:
+    - workout_type - код тренировки ('SWM', 'RUN', 'WLK')
+    - weight - вес спортсмена
+    - params - постоянные параметры вида тренировки
+      (например, height или length_pool)
+
+    Пример:
+
+        session = TrainingSession('RUN', weight=75)
+        session.add(action=500, duration=0.05)
+        session.info_message()
+    """
+
+    def __init__(self, workout_type: str, weight: float,
+                 **params: float) -> None:
+        if workout_type not in WORKOUT_TYPES:
+            raise ValueError(f"Такой тренировки - {workout_type}, не найдено")
+        cls = WORKOUT_TYPES[workout_type]
+        names = [field.name for field in fields(cls)]
+        self.accumulated = tuple(name for name in names
+                                 if name in ACCUMULATED)
+        values: Dict[str, float] = dict.fromkeys(self.accumulated, 0)
+        values['weight'] = weight
+        values.update(params)
+        missing = [name for name in names if name not in values]
+        unknown = [name for name in values if name not in names]
+        if missing or unknown:
+            raise TypeError(
+                f"{cls.__name__}: не хватает параметров {missing}, "
+                f"лишние параметры {unknown}"
+            )
+        self.workout_type = workout_type
+        self.updates = 0
+        self._training: Training = cls(**values)
+
+    def _check(self, names) -> None:
+        """Все поля должны накапливаться, иначе ``TypeError``."""
+        unknown = [name for name in names if name not in self.accumulated]
+        if unknown:
+            raise TypeError(
+                f"Поля {', '.join(unknown)} не накапливаются у "
+                f"{type(self._training).__name__}"
+            )
+
+    def add(self, **deltas: float) -> None:
+        """
+        Прибавить приращения накапливаемых полей.
+        Поля проверяются до изменения: при ошибке сессия не меняется.
+        """
+        self._check(deltas)
+        training = self._training
+        for name, delta in deltas.items():
+            setattr(training, name, getattr(training, name) + delta)
+        self.updates += 1
+
+    def update(self, **totals: float) -> None:
+        """
+        Принять накопленные итоговые значения (не приращения).
+        Значения записываются как есть, без вычитания и сложения.
+        """
+        self._check(totals)
+        training = self._training
+        for name, value in totals.items():
+            setattr(training, name, value)
+        self.updates += 1
+
+    @property
+    def training(self) -> Training:
+        """Объект тренировки с текущими значениями полей."""
+        return self._training
+
+    @property
+    def distance(self) -> float:
+        return self._training.get_distance()
+
+    @property
+    def mean_speed(self) -> float:
+        """Средняя скорость; до начала отсчёта времени равна нулю."""
+        if not self._training.duration:
+            return 0.0
+        return self._training.get_mean_speed()
+
+    @property
+    def calories(self) -> float:
+        """Калории; до начала отсчёта времени равны нулю."""
+        if not self._training.duration:
+            return 0.0
+        return self._training.get_spent_calories()
+
+    def info_message(self) -> InfoMessage:
+        """Сообщение о тренировке на текущий момент."""
+        training = self._training
+        return InfoMessage(type(training).__name__,
+                           training.duration,
+                           self.distance,
+                           self.mean_speed,
+                           self.calories)
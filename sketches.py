@@ -0,0 +1,262 @@
+"""
+Потоковые топ-K и квантили по результатам тренировок.
+
+- ``TopK`` - ограниченная куча из K лучших записей;
+- ``KLLSketch`` - сжатый набросок для квантилей (алгоритм KLL):
+  память O(k log(n/k)), ошибка ранга порядка 1/k;
+- ``Windowed`` - скользящее окно времени из коротких интервалов
+  (панелей), каждая со своей структурой; при запросе панели окна
+  объединяются;
+- ``Leaderboard`` - готовые запросы по ``InfoMessage``: топ по калориям
+  и перцентили средней скорости по видам тренировок.
+
+Все структуры объединяются методом ``merge``, поэтому их можно считать
+в разных процессах и сводить вместе.
+"""
+import heapq
+import random
+from collections import deque
+from functools import partial
+from typing import (Callable, Deque, Dict, Generic, Hashable, List,
+                    Optional, Tuple, TypeVar)
+
+from homework import InfoMessage
+
+T = TypeVar('T')
+DEFAULT_K = 200
+
+
+class TopK:
+    """
+    K записей с наибольшей оценкой.
+
+    Входные переменные:
+    - k - сколько записей хранить
+    """
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self._heap: List[Tuple[float, int, object]] = []
+        # порядковый номер различает записи с равной оценкой
+        self._added = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, score: float, item: object) -> None:
+        """Учесть запись с оценкой ``score``; O(log k)."""
+        self._added += 1
+        entry = (score, self._added, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: 'TopK') -> None:
+        for score, _, item in other._heap:
+            self.add(score, item)
+
+    def items(self) -> List[Tuple[float, object]]:
+        """Записи ``(оценка, запись)`` по убыванию оценки."""
+        return [(score, item) for score, _, item
+                in sorted(self._heap, key=lambda entry: -entry[0])]
+
+
+class KLLSketch:
+    """
+    Набросок KLL для приближённых квантилей.
+
+    Значения хранятся уровнями (компакторами): элемент уровня h весит
+    2**h. Переполненный уровень сортируется, и каждый второй элемент
+    (со случайным сдвигом) переходит на уровень выше.
+
+    Входные переменные:
+    - k - точность: чем больше, тем точнее и больше памяти
+    - seed - начальное значение генератора для воспроизводимости
+    """
+
+    def __init__(self, k: int = DEFAULT_K,
+                 seed: Optional[int] = None) -> None:
+        self.k = k
+        self.count = 0
+        self._random = random.Random(seed)
+        self._levels: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, level: int) -> int:
+        height = len(self._levels)
+        return int(self.k * (2 / 3) ** (height - level - 1)) + 1
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._max_size = sum(self._capacity(level)
+                             for level in range(len(self._levels)))
+
+    def _compress(self) -> None:
+        while self._size >= self._max_size:
+            for level, items in enumerate(self._levels):
+                if len(items) >= self._capacity(level):
+                    if level + 1 >= len(self._levels):
+                        self._grow()
+                    items.sort()
+                    offset = self._random.randint(0, 1)
+                    promoted = items[offset::2]
+                    self._levels[level + 1].extend(promoted)
+                    self._size -= len(items) - len(promoted)
+                    self._levels[level] = []
+                    break
+
+    def add(self, value: float) -> None:
+        """Учесть значение; амортизированно O(1)."""
+        self._levels[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: 'KLLSketch') -> None:
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self._size = sum(len(items) for items in self._levels)
+        self.count += other.count
+        self._compress()
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        return sorted((value, 1 << level)
+                      for level, items in enumerate(self._levels)
+                      for value in items)
+
+    def quantile(self, q: float) -> float:
+        """Приближённый квантиль уровня ``q`` (от 0 до 1)."""
+        weighted = self._weighted()
+        if not weighted:
+            raise ValueError("Набросок пуст")
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+
+class Windowed(Generic[T]):
+    """
+    Скользящее окно из панелей фиксированной длительности.
+
+    Входные переменные:
+    - window_seconds - длина окна
+    - pane_seconds - длина панели (точность границы окна)
+    - factory - создаёт пустую структуру панели (``TopK``, ``KLLSketch``)
+    """
+
+    def __init__(self, window_seconds: float, pane_seconds: float,
+                 factory: Callable[[], T]) -> None:
+        self.window_seconds = window_seconds
+        self.pane_seconds = pane_seconds
+        self.factory = factory
+        self._panes: Deque[Tuple[float, T]] = deque()
+        self._latest = float('-inf')
+
+    def _expire(self, now: float) -> None:
+        deadline = now - self.window_seconds
+        panes = self._panes
+        while panes and panes[0][0] + self.pane_seconds <= deadline:
+            panes.popleft()
+
+    def pane(self, timestamp: float) -> T:
+        """Структура панели, в которую попадает ``timestamp``."""
+        self._latest = max(self._latest, timestamp)
+        start = timestamp - timestamp % self.pane_seconds
+        position = len(self._panes)
+        for pane_start, structure in reversed(self._panes):
+            if pane_start == start:
+                return structure
+            if pane_start < start:
+                break
+            position -= 1
+        # записи не по порядку вставляются на своё место по времени
+        structure = self.factory()
+        self._panes.insert(position, (start, structure))
+        self._expire(self._latest)
+        return structure
+
+    def merged(self, now: float) -> T:
+        """Объединение панелей, попадающих в окно на момент ``now``."""
+        self._expire(now)
+        result = self.factory()
+        for _, structure in self._panes:
+            result.merge(structure)
+        return result
+
+    def merge(self, other: 'Windowed[T]') -> None:
+        """Добавить панели ``other``; сам ``other`` не меняется."""
+        panes: Dict[float, T] = dict(self._panes)
+        for start, structure in other._panes:
+            if start not in panes:
+                panes[start] = self.factory()
+            panes[start].merge(structure)
+        self._panes = deque(sorted(panes.items()))
+        self._latest = max(self._latest, other._latest)
+
+
+class Leaderboard:
+    """
+    Таблица лидеров по потоку сообщений ``show_training_info()``.
+
+    Входные переменные:
+    - window_seconds - длина скользящего окна (например, час)
+    - pane_seconds - шаг сдвига окна
+    - top_k - сколько лидеров по калориям хранить
+    - sketch_k - точность наброска квантилей скорости
+    """
+
+    def __init__(self, window_seconds: float = 3600,
+                 pane_seconds: float = 60,
+                 top_k: int = 100,
+                 sketch_k: int = DEFAULT_K) -> None:
+        self.window_seconds = window_seconds
+        self.pane_seconds = pane_seconds
+        self.sketch_k = sketch_k
+        # partial вместо lambda: таблицу можно передать между процессами
+        self.calories = Windowed(window_seconds, pane_seconds,
+                                 partial(TopK, top_k))
+        self.speeds: Dict[str, Windowed] = {}
+
+    def add(self, info: InfoMessage, timestamp: float,
+            key: Hashable = None) -> None:
+        """Учесть сообщение; ``key`` - например, id спортсмена."""
+        self.calories.pane(timestamp).add(info.calories, (key, info))
+        speeds = self.speeds.get(info.training_type)
+        if speeds is None:
+            speeds = self.speeds[info.training_type] = Windowed(
+                self.window_seconds, self.pane_seconds,
+                partial(KLLSketch, self.sketch_k))
+        speeds.pane(timestamp).add(info.speed)
+
+    def top_calories(self, now: float,
+                     k: Optional[int] = None) -> List[Tuple[float, object]]:
+        """Лидеры по калориям в окне: ``(калории, (key, InfoMessage))``."""
+        items = self.calories.merged(now).items()
+        return items if k is None else items[:k]
+
+    def speed_quantile(self, training_type: str, q: float,
+                       now: float) -> float:
+        """Квантиль средней скорости вида тренировки в окне."""
+        if training_type not in self.speeds:
+            raise ValueError(f"Нет данных о тренировке {training_type}")
+        return self.speeds[training_type].merged(now).quantile(q)
+
+    def merge(self, other: 'Leaderboard') -> None:
+        """Добавить данные другой таблицы, не меняя ``other``."""
+        self.calories.merge(other.calories)
+        for training_type, speeds in other.speeds.items():
+            if training_type not in self.speeds:
+                self.speeds[training_type] = Windowed(
+                    self.window_seconds, self.pane_seconds,
+                    partial(KLLSketch, self.sketch_k))
+            self.speeds[training_type].merge(speeds)
@@ -0,0 +1,124 @@
+"""
+Разбивка тренировки на отрезки по посекундным отсчётам датчиков.
+
+``SampledTraining`` хранит массив отсчётов (шаги или гребки за каждый
+интервал опроса) и считает показатели для всех отрезков - по времени
+(``splits``) или по дистанции (``laps``) - за один векторный проход:
+суммы по отрезкам берутся из накопленных сумм, а дистанция, скорость и
+калории - из ``batch.compute_batch`` с формулами и константами классов
+тренировок. Объекты ``Running`` на каждый отрезок не создаются.
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from batch import BATCH_WORKOUTS, BatchResult, compute_batch
+
+SECONDS_IN_HOUR = 3600
+
+
+class SampledTraining:
+    """
+    Тренировка, заданная отсчётами датчика.
+
+    Входные переменные:
+    - workout_type - код тренировки ('SWM', 'RUN', 'WLK')
+    - actions - количество действий за каждый отсчёт
+    - weight - вес спортсмена
+    - sample_seconds - длительность одного отсчёта в секундах
+    - height - рост (для спортивной ходьбы)
+    - length_pool - длина бассейна (для плавания)
+    - pool_counts - сколько бассейнов проплыто за каждый отсчёт
+      (для плавания)
+    """
+
+    def __init__(self, workout_type: str,
+                 actions: Sequence[int],
+                 weight: float,
+                 sample_seconds: float = 1.0,
+                 height: Optional[float] = None,
+                 length_pool: Optional[float] = None,
+                 pool_counts: Optional[Sequence[float]] = None) -> None:
+        if workout_type not in BATCH_WORKOUTS:
+            raise ValueError(f"Такой тренировки - {workout_type}, не найдено")
+        self.workout_type = workout_type
+        self.actions = np.asarray(actions, dtype=np.int64)
+        self.weight = weight
+        self.sample_seconds = sample_seconds
+        self.params: Dict[str, float] = {}
+        if height is not None:
+            self.params['height'] = height
+        if length_pool is not None:
+            self.params['length_pool'] = length_pool
+        self.pool_counts = (None if pool_counts is None
+                            else np.asarray(pool_counts, dtype=np.float64))
+        if (self.pool_counts is not None
+                and len(self.pool_counts) != len(self.actions)):
+            raise ValueError("Отсчёты гребков и бассейнов разной длины")
+        # накопленные суммы с нулём в начале: сумма по [a, b) = c[b] - c[a]
+        self._actions_cumsum = np.concatenate(
+            ([0], np.cumsum(self.actions)))
+        self._pools_cumsum = (
+            None if self.pool_counts is None
+            else np.concatenate(([0.0], np.cumsum(self.pool_counts))))
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def _compute_pairs(self, starts: np.ndarray,
+                       ends: np.ndarray) -> BatchResult:
+        """Показатели отрезков отсчётов [starts[i], ends[i])."""
+        size = len(starts)
+        columns = {
+            'action': self._actions_cumsum[ends]
+            - self._actions_cumsum[starts],
+            'duration': (ends - starts) * self.sample_seconds
+            / SECONDS_IN_HOUR,
+            'weight': np.full(size, self.weight, dtype=np.float64),
+        }
+        for name, value in self.params.items():
+            columns[name] = np.full(size, value, dtype=np.float64)
+        if self._pools_cumsum is not None:
+            columns['count_pool'] = (self._pools_cumsum[ends]
+                                     - self._pools_cumsum[starts])
+        return compute_batch(self.workout_type, columns)
+
+    def _compute(self, bounds: np.ndarray) -> BatchResult:
+        """Показатели отрезков между соседними границами ``bounds``."""
+        return self._compute_pairs(bounds[:-1], bounds[1:])
+
+    def splits(self, every_seconds: float = 60) -> BatchResult:
+        """
+        Показатели отрезков фиксированной длительности (например, по
+        минутам). Последний отрезок может быть короче.
+        """
+        step = max(1, int(round(every_seconds / self.sample_seconds)))
+        bounds = np.arange(0, len(self) + step, step)
+        bounds[-1] = min(bounds[-1], len(self))
+        return self._compute(np.unique(bounds))
+
+    def laps(self, lap_km: float) -> BatchResult:
+        """
+        Показатели кругов по ``lap_km`` километров.
+        Граница круга - первый отсчёт, на котором накопленная дистанция
+        достигла очередной отметки; последний круг может быть неполным.
+        """
+        cls = BATCH_WORKOUTS[self.workout_type][0]
+        distance = self._actions_cumsum * cls.LEN_STEP / cls.M_IN_KM
+        marks = np.arange(lap_km, distance[-1], lap_km)
+        bounds = np.searchsorted(distance, marks)
+        return self._compute(
+            np.unique(np.concatenate(([0], bounds, [len(self)]))))
+
+    def rolling_speed(self, window_seconds: float) -> np.ndarray:
+        """
+        Скользящая средняя скорость (км/ч) по окну ``window_seconds``,
+        по одному значению на каждое полное окно.
+        """
+        window = max(1, int(round(window_seconds / self.sample_seconds)))
+        bounds = np.arange(len(self) - window + 1)
+        return self._compute_pairs(bounds, bounds + window).speed
+
+    def total(self) -> BatchResult:
+        """Показатели всей тренировки одной строкой."""
+        return self._compute(np.array([0, len(self)]))
@@ -0,0 +1,202 @@
+"""
+Двоичный формат хранения результатов тренировок.
+
+Файл состоит из заголовка фиксированного размера и записей фиксированной
+ширины (``RECORD``): код вида тренировки и четыре числа ``float64`` -
+длительность, дистанция, скорость и калории. Коды раскрываются в
+названия тренировок по таблице из заголовка.
+
+Чтение идёт через ``mmap`` без разбора текста: ``ResultReader.columns()``
+отдаёт столбцы как представления NumPy над отображённым файлом, без
+копирования, а ``iter_unpack`` позволяет обойтись и без NumPy.
+"""
+import mmap
+import struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+from homework import InfoMessage, Training
+
+MAGIC = b'TRKR'
+VERSION = 1
+HEADER_SIZE = 512
+NAME_SIZE = 32
+MAX_TYPES = (HEADER_SIZE - 8) // NAME_SIZE
+# код тренировки, 7 байт выравнивания и четыре float64
+RECORD = struct.Struct('<B7x4d')
+COLUMNS = ('duration', 'distance', 'speed', 'calories')
+DEFAULT_BUFFER_RECORDS = 4096
+
+
+def record_dtype():
+    """Тип записи для NumPy (импортируется только при необходимости)."""
+    import numpy as np
+
+    return np.dtype({
+        'names': ['code'] + list(COLUMNS),
+        'formats': ['u1'] + ['<f8'] * len(COLUMNS),
+        'offsets': [0, 8, 16, 24, 32],
+        'itemsize': RECORD.size,
+    })
+
+
+def _pack_header(training_types: List[str]) -> bytes:
+    header = bytearray(HEADER_SIZE)
+    struct.pack_into('<4sHH', header, 0, MAGIC, VERSION,
+                     len(training_types))
+    for index, name in enumerate(training_types):
+        struct.pack_into(f'{NAME_SIZE}s', header, 8 + index * NAME_SIZE,
+                         name.encode('utf-8'))
+    return bytes(header)
+
+
+def _unpack_header(header: bytes) -> List[str]:
+    magic, version, count = struct.unpack_from('<4sHH', header, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Файл не является файлом результатов тренировок")
+    return [
+        struct.unpack_from(f'{NAME_SIZE}s', header, 8 + index * NAME_SIZE)
+        [0].rstrip(b'\0').decode('utf-8')
+        for index in range(count)
+    ]
+
+
+class ResultWriter:
+    """
+    Запись результатов в двоичный файл.
+
+    Записи копятся в буфере и сбрасываются на диск порциями, таблица
+    видов тренировок записывается в заголовок при закрытии файла.
+
+    Входные переменные:
+    - path - путь к файлу
+    - buffer_records - сколько записей держать в буфере
+    """
+
+    def __init__(self, path: str,
+                 buffer_records: int = DEFAULT_BUFFER_RECORDS) -> None:
+        self.path = path
+        self.buffer_records = buffer_records
+        self.training_types: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._buffer = bytearray()
+        self._pending = 0
+        self.count = 0
+        self._file: BinaryIO = open(path, 'wb')
+        self._file.write(_pack_header([]))
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _code(self, training_type: str) -> int:
+        code = self._codes.get(training_type)
+        if code is None:
+            if len(self.training_types) >= MAX_TYPES:
+                raise ValueError(
+                    f"В файле может быть не больше {MAX_TYPES} видов "
+                    "тренировок"
+                )
+            if len(training_type.encode('utf-8')) > NAME_SIZE:
+                raise ValueError(
+                    f"Слишком длинное название тренировки: {training_type}")
+            code = self._codes[training_type] = len(self.training_types)
+            self.training_types.append(training_type)
+        return code
+
+    def write(self, info: InfoMessage) -> None:
+        """Записать одно сообщение о тренировке."""
+        self._buffer += RECORD.pack(self._code(info.training_type),
+                                    info.duration, info.distance,
+                                    info.speed, info.calories)
+        self._pending += 1
+        self.count += 1
+        if self._pending >= self.buffer_records:
+            self.flush()
+
+    def write_training(self, training: Training) -> None:
+        """Записать результат ``training.show_training_info()``."""
+        self.write(training.show_training_info())
+
+    def write_many(self, messages: Iterable[InfoMessage]) -> None:
+        for info in messages:
+            self.write(info)
+
+    def flush(self) -> None:
+        """Сбросить буфер записей на диск."""
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Дописать буфер, обновить заголовок и закрыть файл."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.seek(0)
+        self._file.write(_pack_header(self.training_types))
+        self._file.close()
+
+
+class ResultReader:
+    """
+    Чтение двоичного файла результатов через ``mmap``.
+
+    Входные переменные:
+    - path - путь к файлу
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as source:
+            self._mmap = mmap.mmap(source.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        try:
+            self.training_types = _unpack_header(self._mmap[:HEADER_SIZE])
+            size = len(self._mmap) - HEADER_SIZE
+            if size < 0 or size % RECORD.size:
+                raise ValueError(
+                    "Файл результатов повреждён: неполная запись")
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+        self.count = size // RECORD.size
+
+    def __enter__(self) -> 'ResultReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def records(self) -> Iterator[Tuple[int, float, float, float, float]]:
+        """Записи как кортежи (code, duration, distance, speed, calories)."""
+        view = memoryview(self._mmap)[HEADER_SIZE:]
+        try:
+            yield from RECORD.iter_unpack(view)
+        finally:
+            view.release()
+
+    def __iter__(self) -> Iterator[InfoMessage]:
+        names = self.training_types
+        for code, *values in self.records():
+            yield InfoMessage(names[code], *values)
+
+    def columns(self):
+        """
+        Столбцы файла как представления NumPy без копирования.
+
+        Возвращает структурированный массив над отображённым в память
+        файлом: ``columns()['calories']`` - столбец калорий, ``['code']`` -
+        коды видов тренировок (см. ``training_types``).
+        """
+        import numpy as np
+
+        return np.memmap(self.path, dtype=record_dtype(), mode='r',
+                         offset=HEADER_SIZE, shape=(self.count,))
+
+    def close(self) -> None:
+        self._mmap.close()
@@ -0,0 +1,131 @@
+"""
+Потоковая обработка пакетов из файла или стандартного ввода.
+
+Пакеты читаются лениво (генераторами), обрабатываются порциями через
+``read_package`` и ``show_training_info``, а сообщения пишутся в вывод
+одним вызовом ``write`` на порцию. Память не зависит от размера входа.
+
+Поддерживаемые форматы записей:
+- csv: ``SWM,720,1,80,25,40`` - код тренировки и данные датчиков;
+- jsonl: ``["SWM", [720, 1, 80, 25, 40]]`` либо
+  ``{"workout_type": "SWM", "data": [720, 1, 80, 25, 40]}``.
+
+Запуск: ``python stream.py [файл] [--format csv|jsonl]``.
+"""
+import argparse
+import csv
+import json
+import sys
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from homework import read_packages
+
+Number = Union[int, float]
+Record = Tuple[str, List[Number]]
+
+FORMATS = ('csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def _number(value: str) -> Number:
+    """Преобразовать строку в int, а если не получится - во float."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Record]:
+    """Лениво читать записи формата csv."""
+    for row in csv.reader(lines):
+        if not row or not row[0].strip():
+            continue
+        yield row[0].strip(), [_number(value) for value in row[1:]]
+
+
+def read_jsonl(lines: Iterable[str]) -> Iterator[Record]:
+    """Лениво читать записи формата json lines."""
+    for line in lines:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        if isinstance(item, dict):
+            yield item['workout_type'], item['data']
+        else:
+            workout_type, data = item
+            yield workout_type, data
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+def read_records(lines: Iterable[str],
+                 fmt: str = 'jsonl') -> Iterator[Record]:
+    """Лениво читать записи ``(workout_type, data)`` заданного формата."""
+    if fmt not in READERS:
+        raise ValueError(f"Такой формат - {fmt}, не поддерживается")
+    return READERS[fmt](lines)
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Разбить поток на порции не больше ``size`` элементов."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_messages(records: Iterable[Record]) -> Iterator[str]:
+    """Лениво получать строки сообщений для потока записей."""
+    for training in read_packages(records):
+        yield training.show_training_info().get_message()
+
+
+def process_stream(records: Iterable[Record],
+                   out: IO[str],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Обработать поток записей и записать сообщения в ``out``.
+
+    Сообщения накапливаются порциями по ``chunk_size`` и записываются
+    одним вызовом ``write``. Возвращает количество обработанных записей.
+    """
+    count = 0
+    for chunk in chunked(iter_messages(records), chunk_size):
+        out.write('\n'.join(chunk) + '\n')
+        count += len(chunk)
+    return count
+
+
+def guess_format(path: str) -> str:
+    """Определить формат записей по расширению файла."""
+    return 'csv' if path.endswith('.csv') else 'jsonl'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('path', nargs='?', default='-',
+                        help='файл с пакетами, "-" - стандартный ввод')
+    parser.add_argument('--format', choices=FORMATS, default=None)
+    parser.add_argument('--chunk-size', type=int,
+                        default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or guess_format(args.path)
+    if args.path == '-':
+        return process_stream(read_records(sys.stdin, fmt), sys.stdout,
+                              args.chunk_size)
+    with open(args.path, encoding='utf-8', newline='') as source:
+        return process_stream(read_records(source, fmt), sys.stdout,
+                              args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
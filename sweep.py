@@ -0,0 +1,60 @@
+"""
+Перебор калорийных коэффициентов на неизменном наборе данных.
+
+Вместо изменения ClassVar-констант и повторного прогона всех тренировок
+варианты коэффициентов собираются в столбцы формы (варианты, 1), а
+данные - в строки формы (1, записи). Формулы из ``batch`` считаются
+один раз с broadcasting по оси вариантов. Классы тренировок при этом не
+меняются.
+"""
+from types import SimpleNamespace
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from batch import BATCH_WORKOUTS, Columns, column_arrays
+
+# константы, которые можно менять в вариантах
+TUNABLE = ('LEN_STEP', 'M_IN_KM', 'TIME_CONST',
+           'coeff_calorie_1', 'coeff_calorie_2', 'coeff_calorie_3')
+
+
+def sweep_calories(workout_type: str,
+                   columns: Columns,
+                   variants: Sequence[Mapping[str, float]]) -> np.ndarray:
+    """
+    Калории для каждого варианта коэффициентов.
+
+    Входные параметры:
+    - workout_type - код тренировки ('SWM', 'RUN', 'WLK')
+    - columns - столбцы данных, как для ``batch.compute_batch``
+    - variants - варианты, например ``[{'coeff_calorie_1': 18},
+      {'coeff_calorie_1': 20, 'coeff_calorie_2': 22}]``; константы,
+      не указанные в варианте, берутся из класса тренировки
+
+    Возвращает:
+    - массив формы (len(variants), количество записей); строка i равна
+      калориям ``compute_batch`` при константах варианта i
+    """
+    arrays = column_arrays(workout_type, columns)
+    cls, _, formula = BATCH_WORKOUTS[workout_type]
+    tunable = [name for name in TUNABLE if hasattr(cls, name)]
+    for variant in variants:
+        unknown = [name for name in variant if name not in tunable]
+        if unknown:
+            raise ValueError(
+                f"У {cls.__name__} нет констант: {', '.join(unknown)}")
+
+    constants = SimpleNamespace(**{
+        name: np.array([variant.get(name, getattr(cls, name))
+                        for variant in variants],
+                       dtype=np.float64)[:, np.newaxis]
+        for name in tunable
+    })
+    rows = {name: array[np.newaxis, :] for name, array in arrays.items()}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _, _, calories = formula(rows, constants)
+    shape = (len(variants), len(arrays['duration']))
+    if calories.shape != shape:
+        calories = np.broadcast_to(calories, shape).copy()
+    return calories
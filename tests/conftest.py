@@ -1,10 +1,62 @@
+import os
+import random
 import sys
 from pathlib import Path
 from io import StringIO
 
+import pytest
+
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 sys.path.append(str(BASE_DIR))
 
+import homework
+
+# замеры времени зависят от нагрузки машины, поэтому включаются явно:
+# TRACKER_TIMING_TESTS=1 pytest
+timing = pytest.mark.skipif(
+    not os.environ.get('TRACKER_TIMING_TESTS'),
+    reason='замеры времени включаются переменной TRACKER_TIMING_TESTS=1',
+)
+
+# общие пакеты для тестов потоковой обработки, сервера и хранилищ
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+EXPECTED = [
+    homework.read_package(*package).show_training_info().get_message()
+    for package in PACKAGES
+]
+
+
+def random_packages(size, seed=0, workout_types=('RUN', 'SWM', 'WLK'),
+                    digits=None):
+    """
+    Воспроизводимые случайные пакеты ``(workout_type, data)``.
+
+    Скорости бывают большими, чтобы у ходьбы работала часть с
+    ``// height``; ``digits`` округляет дробные значения, как датчики.
+    """
+    rnd = random.Random(seed)
+
+    def uniform(low, high):
+        value = rnd.uniform(low, high)
+        return value if digits is None else round(value, digits)
+
+    packages = []
+    for _ in range(size):
+        workout_type = rnd.choice(workout_types)
+        data = [rnd.randint(0, 400000),
+                rnd.choice([1, 0.5, uniform(0.05, 5)]),
+                uniform(30, 150)]
+        if workout_type == 'WLK':
+            data.append(uniform(50, 220))
+        elif workout_type == 'SWM':
+            data.extend([rnd.choice([25, 50]), rnd.randint(0, 400)])
+        packages.append((workout_type, data))
+    return packages
+
 
 class Capturing(list):
     """
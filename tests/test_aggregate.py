@@ -0,0 +1,88 @@
+import pytest
+
+import aggregate
+import homework
+
+WEEK = 7 * 24 * 3600
+RECORDS = [
+    ('anna', 0, ('RUN', [15000, 1, 75])),
+    ('anna', 3600, ('RUN', [9000, 2, 75])),
+    ('anna', WEEK + 10, ('SWM', [720, 1, 80, 25, 40])),
+    ('ivan', 100, ('WLK', [9000, 1, 75, 180])),
+]
+
+
+def make_aggregator():
+    aggregator = aggregate.Aggregator(bucket_seconds=WEEK)
+    for user, timestamp, package in RECORDS:
+        aggregator.add_training(homework.read_package(*package),
+                                user, timestamp)
+    return aggregator
+
+
+def test_aggregator_groups():
+    aggregator = make_aggregator()
+    assert len(aggregator) == 3
+    totals = aggregator.groups[('anna', 'Running', 0)]
+    assert totals.count == 2
+    assert totals.duration == 3
+    assert totals.distance == pytest.approx(9.75 + 5.85)
+    assert totals.mean_speed == pytest.approx((9.75 * 1 + 2.925 * 2) / 3)
+
+
+def test_aggregator_report_and_merge():
+    aggregator = make_aggregator()
+    by_user = aggregator.report(by=('user',))
+    assert set(by_user) == {('anna',), ('ivan',)}
+    assert by_user[('anna',)].count == 3
+
+    other = make_aggregator()
+    other.merge(aggregator)
+    assert other.report(by=())[()].count == 2 * len(RECORDS)
+    with pytest.raises(ValueError):
+        other.merge(aggregate.Aggregator())
+    with pytest.raises(ValueError):
+        aggregator.report(by=('week',))
+
+
+def test_aggregator_add_batch():
+    pytest.importorskip('numpy')
+    import batch
+
+    result = batch.compute_batch('RUN', {'action': [15000, 9000],
+                                         'duration': [1, 2],
+                                         'weight': [75, 75]})
+    aggregator = aggregate.Aggregator(bucket_seconds=WEEK)
+    aggregator.add_batch(result, users=['anna', 'anna'],
+                         timestamps=[0, 3600])
+    expected = make_aggregator().groups[('anna', 'Running', 0)]
+    assert aggregator.groups == {('anna', 'Running', 0): expected}
+
+
+@pytest.mark.parametrize('users', [
+    ['anna', 'boris', 'anna', None],
+    [1, '1', 1, '1'],
+    [1, 2, 1, 2],
+    ['anna', 'boris', 'anna', 'boris'],
+])
+def test_add_batch_groups_without_info_messages(monkeypatch, users):
+    pytest.importorskip('numpy')
+    import batch
+
+    packages = [[15000, 1, 75], [9000, 2, 80], [3000, 0.5, 60],
+                [12000, 1.5, 70]]
+    timestamps = [0, 3600, WEEK + 1, 10]
+    result = batch.compute_batch('RUN', dict(zip(
+        ('action', 'duration', 'weight'), zip(*packages))))
+    expected = aggregate.Aggregator(bucket_seconds=WEEK)
+    for data, user, timestamp in zip(packages, users, timestamps):
+        expected.add_training(homework.read_package('RUN', data), user,
+                              timestamp)
+    monkeypatch.setattr(type(result), 'info_message', None)
+    aggregator = aggregate.Aggregator(bucket_seconds=WEEK)
+    aggregator.add_batch(result, users=users, timestamps=timestamps)
+    assert aggregator.groups == expected.groups, (
+        'Пакетные итоги должны совпадать с поштучными'
+    )
+    assert ({type(user) for user, _, _ in aggregator.groups}
+            == {type(user) for user in users})
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+import archive
+import homework
+import conftest
+from conftest import random_packages
+
+PACKAGES = conftest.PACKAGES + [
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [300, 0.5, 60.5, 170]),
+]
+TIMESTAMPS = [0.0, 10.5, 20.25, 30.0, 40.001]
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = str(tmp_path / 'packages.trka')
+    with archive.ArchiveWriter(path, block_records=2) as writer:
+        writer.write_many(PACKAGES, TIMESTAMPS)
+    return path
+
+
+def test_roundtrip(archive_path):
+    with archive.ArchiveReader(archive_path) as reader:
+        assert len(reader) == len(PACKAGES)
+        assert len(reader.blocks) == 3
+        assert reader.codes == ['SWM', 'RUN', 'WLK']
+        assert list(reader.packages()) == PACKAGES, (
+            'Прочитанные пакеты должны совпадать с записанными'
+        )
+        assert [time for time, _, _ in reader.records()] == TIMESTAMPS
+
+
+def test_time_range_reads_only_needed_blocks(archive_path):
+    with archive.ArchiveReader(archive_path) as reader:
+        assert reader.select(15, 31) == [1]
+        assert list(reader.packages(15, 30)) == PACKAGES[2:3]
+        assert list(reader.packages(start=30)) == PACKAGES[3:]
+
+
+def test_replay_to_trainings(archive_path):
+    with archive.ArchiveReader(archive_path) as reader:
+        messages = [training.show_training_info()
+                    for training in reader.trainings()]
+    assert messages == [homework.read_package(*package).show_training_info()
+                        for package in PACKAGES]
+
+
+def test_writer_rejects_bad_packages(tmp_path):
+    with archive.ArchiveWriter(str(tmp_path / 'bad.trka')) as writer:
+        with pytest.raises(ValueError):
+            writer.write('RUN', [15000.5, 1, 75])
+        writer.write('RUN', [15000, 1, 75])
+        with pytest.raises(ValueError):
+            writer.write('RUN', [15000, 1, 75, 180])
+
+
+def test_reader_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        archive.ArchiveReader(str(path))
+
+
+def test_archive_is_smaller_than_json(tmp_path):
+    packages = random_packages(5000, digits=2)
+    path = tmp_path / 'packages.trka'
+    with archive.ArchiveWriter(str(path)) as writer:
+        writer.write_many(packages, range(len(packages)))
+    text = ''.join(json.dumps(package) + '\n' for package in packages)
+    assert path.stat().st_size < len(text.encode('utf-8')) / 2
+
+
+def test_column_blocks_match_python_path(tmp_path):
+    np = pytest.importorskip('numpy')
+    import batch
+
+    packages = random_packages(3000, seed=1, digits=2)
+    path = str(tmp_path / 'packages.trka')
+    with archive.ArchiveWriter(str(path), block_records=1000) as writer:
+        writer.write_many(packages, range(len(packages)))
+    with archive.ArchiveReader(path) as reader:
+        blocks = list(reader.column_blocks(500, 2500))
+        results = list(reader.batches(500, 2500))
+    assert len(blocks) == 3
+    selected = packages[500:2500]
+    for workout_type, names in (('RUN', ('action', 'duration', 'weight')),
+                                ('WLK', ('action', 'duration', 'weight',
+                                         'height'))):
+        rows = [data for code, data in selected if code == workout_type]
+        decoded = {name: np.concatenate([block[workout_type][name]
+                                         for block in blocks])
+                   for name in names}
+        for position, name in enumerate(names):
+            assert decoded[name].tolist() == [row[position] for row in rows]
+    calories = sorted(value for result in results
+                      for value in result.calories.tolist())
+    expected = []
+    for workout_type in ('RUN', 'WLK', 'SWM'):
+        rows = [data for code, data in selected if code == workout_type]
+        columns = dict(zip(archive.column_names(workout_type, len(rows[0])),
+                           zip(*rows)))
+        expected.extend(batch.compute_batch(workout_type,
+                                            columns).calories.tolist())
+    assert calories == sorted(expected)
+
+
+def test_varints_roundtrip():
+    pytest.importorskip('numpy')
+    values = [0, 5, -3, 2 ** 40, -2 ** 40, 127, 128, 0]
+    encoded = bytearray()
+    archive._write_varints(encoded, values)
+    assert archive._read_varints(bytes(encoded), len(values)) == values
+    assert archive._read_varints_numpy(
+        bytes(encoded), len(values)).tolist() == values
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import batch
+import homework
+from conftest import random_packages
+
+COLUMNS = {
+    'SWM': ('action', 'duration', 'weight', 'length_pool', 'count_pool'),
+    'RUN': ('action', 'duration', 'weight'),
+    'WLK': ('action', 'duration', 'weight', 'height'),
+}
+
+
+def to_columns(workout_type, packages):
+    return {name: [data[i] for data in packages]
+            for i, name in enumerate(COLUMNS[workout_type])}
+
+
+@pytest.mark.parametrize('workout_type', ['SWM', 'RUN', 'WLK'])
+def test_compute_batch_parity(workout_type):
+    packages = [data for _, data in
+                random_packages(500, workout_types=[workout_type])]
+    result = batch.compute_batch(workout_type,
+                                 to_columns(workout_type, packages))
+    assert len(result) == len(packages)
+    for i, data in enumerate(packages):
+        expected = homework.read_package(workout_type,
+                                         data).show_training_info()
+        assert result.info_message(i) == expected, (
+            'Пакетный расчёт должен совпадать с поштучным '
+            f'для пакета {data}'
+        )
+
+
+def test_compute_batch_errors():
+    with pytest.raises(ValueError):
+        batch.compute_batch('XXX', {})
+    with pytest.raises(ValueError):
+        batch.compute_batch('RUN', {'action': [1], 'duration': [1]})
+    with pytest.raises(ValueError):
+        batch.compute_batch('RUN', {'action': [1, 2], 'duration': [1],
+                                    'weight': [75]})
@@ -0,0 +1,22 @@
+import json
+
+from bench import run
+
+
+def test_bench_report(tmp_path):
+    output = tmp_path / 'bench.json'
+    report = run.main(['--scales', '10', '--output', str(output)])
+    assert json.loads(output.read_text(encoding='utf-8')) == report
+    names = {(r['name'], r['workout_type']) for r in report['results']}
+    assert names == {(name, workout_type)
+                     for name in run.BENCHMARKS
+                     for workout_type in run.WORKOUT_TYPES}
+    assert all(r['scale'] == 10 for r in report['results'])
+    assert run.compare(report, report)
+
+
+def test_generate_packages():
+    for workout_type, arity in [('SWM', 5), ('RUN', 3), ('WLK', 4)]:
+        packages = list(run.generate_packages(workout_type, 5))
+        assert len(packages) == 5
+        assert all(len(data) == arity for _, data in packages)
@@ -0,0 +1,104 @@
+import pytest
+
+import cache
+import homework
+
+
+def test_cached_metrics_are_invalidated():
+    cached_running = cache.with_cached_metrics(homework.Running)
+    training = cached_running(15000, 1, 75)
+    assert isinstance(training, homework.Running)
+    assert training.show_training_info() == (
+        homework.Running(15000, 1, 75).show_training_info()
+    )
+    assert training._metrics['get_mean_speed'] == 9.75
+    training.duration = 2
+    assert '_metrics' not in training.__dict__, (
+        'Изменение поля тренировки должно сбрасывать кэш показателей'
+    )
+    assert training.get_mean_speed() == 4.875
+    assert training == cached_running(15000, 2, 75)
+
+
+def test_cached_metrics_swimming():
+    training = cache.with_cached_metrics(homework.Swimming)(
+        720, 1, 80, 25, 40)
+    assert training.get_mean_speed() == 1.0
+    training.count_pool = 80
+    assert training.get_mean_speed() == 2.0
+    assert cache.with_cached_metrics(homework.Swimming) is type(training)
+
+
+def test_package_cache():
+    package_cache = cache.PackageCache(maxsize=2)
+    first = package_cache.read_package('RUN', [15000, 1, 75])
+    assert package_cache.read_package('RUN', [15000, 1, 75]) is first
+    package_cache.read_package('SWM', [720, 1, 80, 25, 40])
+    package_cache.read_package('WLK', [9000, 1, 75, 180])
+    stats = package_cache.stats
+    assert (stats.hits, stats.misses, stats.size) == (1, 3, 2)
+    assert stats.hit_rate == 0.25
+    assert first.show_training_info() == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info()
+    package_cache.clear()
+    assert package_cache.stats.size == 0
+
+
+def test_package_cache_errors():
+    package_cache = cache.PackageCache()
+    with pytest.raises(ValueError):
+        package_cache.read_package('XXX', [1, 2, 3])
+    with pytest.raises(TypeError):
+        package_cache.read_package('RUN', [1, 2])
+
+
+def test_striped_ttl_cache():
+    now = [0.0]
+    striped = cache.StripedTTLCache(maxsize=4, ttl=10, stripes=2,
+                                    clock=lambda: now[0])
+    striped.set('a', 1)
+    assert striped.get('a') == 1
+    assert striped.get('b') is None
+    now[0] = 11
+    assert striped.get('a') is None, 'Запись с истёкшим сроком не отдаётся'
+    for key in range(10):
+        striped.set(key, key)
+    stats = striped.stats
+    assert stats.size <= 4
+    assert stats.evictions == 10 - stats.size
+    assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+
+
+@pytest.mark.parametrize('maxsize, stripes', [(4, 16), (10, 3), (1, 8)])
+def test_striped_cache_never_exceeds_maxsize(maxsize, stripes):
+    striped = cache.StripedTTLCache(maxsize=maxsize, stripes=stripes)
+    for key in range(100):
+        striped.set(key, key)
+    assert striped.stats.size == maxsize, (
+        'Кэш не должен хранить больше maxsize записей'
+    )
+
+
+def test_message_cache_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    packages = [('RUN', [15000, 1, 75]), ('SWM', [720, 1, 80, 25, 40]),
+                ('WLK', [9000, 1, 75, 180])]
+    path = tmp_path / 'common.csv'
+    path.write_text('RUN,15000,1,75\nSWM,720,1,80,25,40\n')
+    messages = cache.MessageCache(maxsize=64, stripes=4)
+    assert messages.warm_up(str(path)) == 2
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(
+            lambda package: messages.get_message(*package), packages * 200))
+    assert results == [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in packages
+    ] * 200
+    stats = messages.stats
+    assert stats.size == 3
+    assert stats.hits + stats.misses == 600
+    assert stats.misses <= 8, (
+        'Прогретые пакеты не должны вычисляться повторно'
+    )
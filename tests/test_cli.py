@@ -0,0 +1,113 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+import cli
+import homework
+from conftest import BASE_DIR, Capturing, timing
+
+# модули, которые не должны загружаться при коротком вызове
+HEAVY_MODULES = ('numpy', 'asyncio', 'argparse', 'json', 'csv',
+                 'concurrent', 'multiprocessing')
+# допустимое время запуска сверх голого интерпретатора, в секундах
+STARTUP_BUDGET = 0.15
+
+
+def run_cli(*args, stdin=''):
+    return subprocess.run(
+        [sys.executable, *args], cwd=BASE_DIR, input=stdin,
+        capture_output=True, text=True, check=False,
+    )
+
+
+def best_time(*args, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_cli(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.mark.parametrize('args, expected', [
+    (['RUN', '15000', '1', '75', 'SWM', '720', '1', '80', '25', '40'],
+     [('RUN', [15000, 1, 75]), ('SWM', [720, 1, 80, 25, 40])]),
+    (['WLK', '9000', '1.5', '75', '180'],
+     [('WLK', [9000, 1.5, 75, 180])]),
+])
+def test_packages_from_args(args, expected):
+    assert list(cli.packages_from_args(args)) == expected
+
+
+def test_packages_from_lines():
+    lines = ['RUN,15000,1,75\n', '\n', '["SWM", [720, 1, 80, 25, 40]]\n',
+             '{"workout_type": "WLK", "data": [9000, 1, 75, 180]}\n']
+    assert list(cli.packages_from_lines(lines)) == [
+        ('RUN', [15000, 1, 75]),
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+
+
+def test_main_output():
+    with Capturing() as output:
+        assert cli.main(['RUN', '15000', '1', '75']) == 0
+    assert output == [homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info().get_message()]
+
+
+def test_cli_reports_bad_packages():
+    result = run_cli('-m', 'cli', stdin='XXX,1\nRUN,15000,1,75\n')
+    assert result.returncode == 1
+    assert 'XXX' in result.stderr
+    assert result.stdout.startswith('Тип тренировки: Running')
+
+
+@pytest.mark.parametrize('args, stdin', [
+    (['WLK', '1e200', '1', '75', '180'], ''),
+    ([], '{"data": [15000, 1, 75]}\n'),
+    ([], '["RUN"]\n'),
+    ([], '[1]\n'),
+])
+def test_cli_reports_errors_without_traceback(args, stdin):
+    result = run_cli('-m', 'cli', *args, stdin=stdin)
+    assert result.returncode == 1
+    assert result.stderr and 'Traceback' not in result.stderr
+
+
+def test_cli_continues_after_bad_line():
+    result = run_cli('-m', 'cli', stdin=(
+        'RUN,abc,1,75\nRUN,15000,1,75\nnot json]\n["RUN"\n'
+        '["SWM", [720, 1, 80, 25, 40]]\n'))
+    assert result.returncode == 1
+    assert result.stdout.splitlines() == [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in [('RUN', [15000, 1, 75]),
+                        ('SWM', [720, 1, 80, 25, 40])]
+    ], 'Ошибочные строки не должны прерывать обработку следующих'
+    assert len(result.stderr.splitlines()) == 3
+    assert 'RUN,abc,1,75' in result.stderr
+
+
+def test_cli_does_not_import_heavy_modules():
+    result = run_cli('-X', 'importtime', '-m', 'cli', 'RUN', '15000',
+                     '1', '75')
+    assert result.returncode == 0
+    imported = {line.rsplit('|', 1)[-1].strip()
+                for line in result.stderr.splitlines()}
+    heavy = sorted(name for name in imported
+                   if name.split('.')[0] in HEAVY_MODULES)
+    assert not heavy, f'Лишние модули при запуске: {heavy}'
+
+
+@timing
+def test_cli_startup_budget():
+    run_cli('-m', 'cli', 'RUN', '15000', '1', '75')  # прогрев __pycache__
+    bare = best_time('-c', 'pass')
+    startup = best_time('-m', 'cli', 'RUN', '15000', '1', '75')
+    assert startup - bare < STARTUP_BUDGET, (
+        f'Запуск занимает {startup:.3f} с при голом интерпретаторе '
+        f'{bare:.3f} с'
+    )
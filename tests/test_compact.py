@@ -0,0 +1,76 @@
+import pickle
+
+import pytest
+
+import compact
+import homework
+import conftest
+
+SLOTTED = {
+    'SWM': compact.SlottedSwimming,
+    'RUN': compact.SlottedRunning,
+    'WLK': compact.SlottedSportsWalking,
+}
+PACKAGES = [(workout_type, data, SLOTTED[workout_type])
+            for workout_type, data in conftest.PACKAGES]
+
+
+@pytest.mark.parametrize('workout_type, data, slotted_cls', PACKAGES)
+def test_slotted_training(workout_type, data, slotted_cls):
+    training = slotted_cls(*data)
+    assert not hasattr(training, '__dict__'), (
+        'Компактный вариант тренировки не должен иметь `__dict__`'
+    )
+    expected = homework.read_package(workout_type, data)
+    assert training.show_training_info() == expected.show_training_info()
+    assert pickle.loads(pickle.dumps(training)) == training
+
+
+def test_slotted_info_message():
+    data = ['Swimming', 1, 75, 1, 80]
+    message = compact.SlottedInfoMessage(*data)
+    assert not hasattr(message, '__dict__')
+    assert 'message' not in compact.SlottedInfoMessage.__slots__
+    assert message.get_message() == homework.InfoMessage(*data).get_message()
+
+
+@pytest.mark.parametrize('workout_type, data, slotted_cls', PACKAGES)
+def test_training_table(workout_type, data, slotted_cls):
+    training_cls = type(homework.read_package(workout_type, data))
+    rows = [data, [value * 2 for value in data]]
+    table = compact.TrainingTable(training_cls, rows)
+    assert len(table) == 2
+    assert list(table.info_messages()) == [
+        training_cls(*row).show_training_info() for row in rows
+    ]
+    assert table.columns()['action'].typecode == 'q'
+    with pytest.raises(TypeError):
+        table.append([1])
+
+
+def test_training_table_integral_float_action():
+    table = compact.TrainingTable(homework.Running)
+    table.append([720.0, 1, 75])
+    assert table.row(0) == (720, 1, 75)
+    with pytest.raises(TypeError):
+        table.append([720.5, 1, 75])
+    assert len(table) == 1, 'Ошибочная строка не должна попадать в таблицу'
+    assert len(table.columns()['duration']) == 1
+
+
+@pytest.mark.parametrize('row', [
+    [720, 1, 'x'],
+    [float('nan'), 1, 75],
+    [float('inf'), 1, 75],
+    ['720', 1, 75],
+    [2 ** 70, 1, 75],
+])
+def test_training_table_bad_row_leaves_table_unchanged(row):
+    table = compact.TrainingTable(homework.Running, [[720, 1, 75]])
+    with pytest.raises(TypeError):
+        table.append(row)
+    assert {name: len(column) for name, column
+            in table.columns().items()} == dict.fromkeys(
+                table.field_names, 1), (
+        'Столбцы не должны меняться при ошибочной строке'
+    )
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import daemon
+import server
+from conftest import BASE_DIR, EXPECTED, PACKAGES, timing
+
+
+@pytest.fixture
+def daemon_socket(tmp_path):
+    path = str(tmp_path / 'tracker.sock')
+    process = subprocess.Popen(
+        [sys.executable, 'daemon.py', 'serve', '--socket', path],
+        cwd=BASE_DIR,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(path):
+            assert time.monotonic() < deadline, 'Демон не запустился'
+            assert process.poll() is None, 'Демон завершился при запуске'
+            time.sleep(0.01)
+        yield path
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def test_error_prefix_matches_server():
+    assert daemon.ERROR_PREFIX == server.ERROR_PREFIX
+
+
+def test_daemon_client(daemon_socket):
+    with daemon.DaemonClient(daemon_socket, fallback=False) as client:
+        assert client.request(PACKAGES) == EXPECTED
+        assert client.request(PACKAGES * 100) == EXPECTED * 100
+
+
+@timing
+def test_daemon_client_latency(daemon_socket):
+    with daemon.DaemonClient(daemon_socket, fallback=False) as client:
+        client.request(PACKAGES[:1])
+        start = time.perf_counter()
+        for _ in range(100):
+            client.request(PACKAGES[:1])
+        latency = (time.perf_counter() - start) / 100
+    assert latency < 0.01, (
+        f'Запрос к демону занимает {latency * 1000:.2f} мс'
+    )
+
+
+def test_daemon_client_command(daemon_socket):
+    result = subprocess.run(
+        [sys.executable, 'daemon.py', '--socket', daemon_socket, 'client',
+         'RUN', '15000', '1', '75', 'XXX', '1'],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert result.stdout.splitlines() == EXPECTED[1:2]
+    assert result.stderr.startswith(daemon.ERROR_PREFIX)
+
+
+def test_client_fallback_without_daemon(tmp_path):
+    path = str(tmp_path / 'missing.sock')
+    with daemon.DaemonClient(path) as client:
+        assert client.request(PACKAGES) == EXPECTED
+    with pytest.raises(FileNotFoundError):
+        daemon.DaemonClient(path, fallback=False).request(PACKAGES)
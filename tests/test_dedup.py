@@ -0,0 +1,75 @@
+import dedup
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [15000, 1.0, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('SWM', [720, 1, 80, 25, 40]),
+]
+
+
+def test_filter_duplicates():
+    deduplicator = dedup.Deduplicator(bloom_bits=1024)
+    unique = list(deduplicator.filter(PACKAGES))
+    assert unique == [PACKAGES[0], PACKAGES[1], PACKAGES[3]]
+    assert deduplicator.stats.total == 5
+    assert deduplicator.stats.duplicates == 2
+    assert deduplicator.stats.dedup_rate == 0.4
+
+
+def test_bloom_false_positives_are_confirmed():
+    # крошечный фильтр почти всегда отвечает «возможно было»
+    deduplicator = dedup.Deduplicator(bloom_bits=8, hashes=1)
+    packages = [('RUN', [action, 1, 75]) for action in range(200)]
+    assert list(deduplicator.filter(packages)) == packages, (
+        'Новый пакет не должен считаться повтором'
+    )
+
+
+def test_time_window_eviction():
+    now = [0.0]
+    deduplicator = dedup.Deduplicator(window_seconds=10,
+                                      clock=lambda: now[0])
+    assert not deduplicator.is_duplicate('RUN', [15000, 1, 75])
+    now[0] = 5
+    assert deduplicator.is_duplicate('RUN', [15000, 1, 75])
+    now[0] = 16
+    assert not deduplicator.is_duplicate('RUN', [15000, 1, 75]), (
+        'Пакет старше окна должен считаться новым'
+    )
+
+
+def test_window_edge():
+    now = [0.0]
+    deduplicator = dedup.Deduplicator(window_seconds=10,
+                                      clock=lambda: now[0])
+    assert not deduplicator.is_duplicate('RUN', [15000, 1, 75])
+    # другие пакеты сменяют поколения фильтра каждые 2.5 секунды
+    for second in range(1, 10):
+        now[0] = second
+        deduplicator.is_duplicate('RUN', [second, 1, 75])
+    now[0] = 9.9
+    assert deduplicator.is_duplicate('RUN', [15000, 1, 75]), (
+        'Повтор внутри окна должен распознаваться у его границы'
+    )
+    now[0] = 20
+    assert not deduplicator.is_duplicate('RUN', [15000, 1, 75]), (
+        'Пакет старше окна должен считаться новым'
+    )
+
+
+def test_max_entries():
+    now = [0.0]
+    deduplicator = dedup.Deduplicator(window_seconds=10, max_entries=2,
+                                      clock=lambda: now[0])
+    for action in range(5):
+        deduplicator.is_duplicate('RUN', [action, 1, 75])
+    assert len(deduplicator) == 2
+    assert deduplicator.is_duplicate('RUN', [0, 1, 75]), (
+        'Вытесненный из индекса пакет в окне распознаётся фильтром'
+    )
+    assert deduplicator.stats.bloom_duplicates == 1
+    assert deduplicator.is_duplicate('RUN', [4, 1, 75])
+    now[0] = 20
+    assert not deduplicator.is_duplicate('RUN', [1, 1, 75])
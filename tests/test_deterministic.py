@@ -0,0 +1,73 @@
+import struct
+
+import pytest
+
+import compact
+import deterministic
+import homework
+from conftest import random_packages
+
+COLUMNS = {
+    'SWM': ('action', 'duration', 'weight', 'length_pool', 'count_pool'),
+    'RUN': ('action', 'duration', 'weight'),
+    'WLK': ('action', 'duration', 'weight', 'height'),
+}
+
+
+def bits(values):
+    return [struct.pack('<d', value) for value in values]
+
+
+def test_ipow_and_rounding():
+    assert deterministic.ipow(1.5, 3) == 1.5 * 1.5 * 1.5
+    assert deterministic.ipow(1.5, 0) == 1.0
+    with pytest.raises(ValueError):
+        deterministic.ipow(1.5, 2.5)
+    assert deterministic.round_fixed(0.1234567895) == 0.12345679
+    assert deterministic.round_fixed(float('inf')) == float('inf')
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_scalar_matches_methods(seed):
+    for workout_type, data in random_packages(300, seed):
+        training = homework.read_package(workout_type, data)
+        assert deterministic.spent_calories(training) == pytest.approx(
+            training.get_spent_calories(), rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_scalar_batch_parallel_are_bit_identical(seed):
+    np = pytest.importorskip('numpy')
+    packages = random_packages(2000, seed)
+    scalar = [deterministic.spent_calories(
+        homework.read_package(workout_type, data))
+        for workout_type, data in packages]
+
+    batched = [None] * len(packages)
+    for workout_type, names in COLUMNS.items():
+        rows = [index for index, (code, _) in enumerate(packages)
+                if code == workout_type]
+        columns = {name: [packages[row][1][position] for row in rows]
+                   for position, name in enumerate(names)}
+        result = deterministic.spent_calories_batch(workout_type, columns)
+        assert isinstance(result, np.ndarray)
+        for row, value in zip(rows, result.tolist()):
+            batched[row] = value
+
+    parallel = deterministic.spent_calories_parallel(
+        packages, workers=2, chunk_size=256)
+    assert bits(batched) == bits(scalar), (
+        'Пакетный расчёт должен совпадать с поштучным до бита'
+    )
+    assert bits(parallel) == bits(scalar), (
+        'Многопроцессный расчёт должен совпадать с поштучным до бита'
+    )
+
+
+def test_slotted_classes_match():
+    for workout_type, data in random_packages(300, 3):
+        training = homework.read_package(workout_type, data)
+        slotted_cls = getattr(compact, 'Slotted' + type(training).__name__)
+        assert bits([deterministic.spent_calories(slotted_cls(*data))]) == (
+            bits([deterministic.spent_calories(training)])
+        ), 'Компактные классы должны давать тот же результат до бита'
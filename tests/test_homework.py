@@ -1,7 +1,9 @@
 import re
+import sys
 import pytest
 import types
 import inspect
+from dataclasses import dataclass
 from conftest import Capturing
 
 try:
@@ -363,3 +365,103 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('input_data', [
+    ['Swimming', 1, 75, 1, 80],
+    ['Running', 4, 20.12345, 4.0005, -20],
+    ['SportsWalking', 12, 6, 12, 6],
+])
+def test_InfoMessage_get_message_matches_format(input_data):
+    info_message = homework.InfoMessage(*input_data)
+    expected = info_message.message.format(
+        training_type=info_message.training_type,
+        duration=info_message.duration,
+        distance=info_message.distance,
+        speed=info_message.speed,
+        calories=info_message.calories,
+    )
+    assert info_message.get_message() == expected, (
+        'Метод `get_message` должен совпадать с `str.format` по шаблону.'
+    )
+
+
+def test_custom_template_is_not_evaluated():
+    template = '{duration:{__import__("os").getpid()}}'
+    info = homework.InfoMessage('Running', 1, 2, 3, 4, message=template)
+    with pytest.raises(KeyError):
+        info.get_message()
+    info.message = '{training_type!r:>10}|{duration:{calories}}'
+    assert info.get_message() == info.message.format(
+        training_type='Running', duration=1, calories=4)
+    assert (homework.compile_template.cache_info().maxsize
+            == homework.TEMPLATE_CACHE_SIZE)
+
+
+def test_render_many():
+    messages = [
+        homework.read_package(*package).show_training_info()
+        for package in [('SWM', [720, 1, 80, 25, 40]),
+                        ('RUN', [15000, 1, 75]),
+                        ('WLK', [9000, 1, 75, 180])]
+    ]
+    expected = ''.join(info.get_message() + '\n' for info in messages)
+    assert homework.render_many(messages) == expected
+    with Capturing() as output:
+        assert homework.render_many(messages, sys.stdout) is None
+    assert output == expected.splitlines()
+
+
+def test_register_workout(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+    monkeypatch.setattr(homework, '_CONSTRUCTORS',
+                        dict(homework._CONSTRUCTORS))
+
+    @homework.register_workout('CYC')
+    @dataclass
+    class Cycling(homework.Running):
+        LEN_STEP = 5.0
+
+    assert homework.WORKOUT_TYPES['CYC'] is Cycling
+    training = homework.read_package('CYC', [100, 1, 75])
+    assert isinstance(training, Cycling)
+    assert training.get_distance() == 0.5
+    with pytest.raises(ValueError):
+        homework.register_workout('RUN')(Cycling)
+
+
+@pytest.mark.parametrize('input_data', [
+    ('RUN', [15000, 1]),
+    ('SWM', [720, 1, 80, 25]),
+    ('WLK', [9000, 1, 75, 180, 1]),
+])
+def test_read_package_wrong_arity(input_data):
+    with pytest.raises(TypeError):
+        homework.read_package(*input_data)
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', lambda: iter([15000, 1, 75])),
+    ('WLK', lambda: (value for value in (9000, 1, 75, 180))),
+    ('SWM', lambda: range(720, 725)),
+])
+def test_read_package_accepts_iterables(workout_type, data):
+    result = homework.read_package(workout_type, data())
+    assert result == homework.read_package(workout_type, list(data())), (
+        'Функция `read_package` должна принимать любой итерируемый объект.'
+    )
+
+
+def test_read_package_unknown_type():
+    with pytest.raises(ValueError):
+        homework.read_package('XXX', [1, 2, 3])
+
+
+def test_read_packages():
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75])]
+    result = list(homework.read_packages(iter(packages)))
+    assert result == [homework.read_package(*package)
+                      for package in packages]
+    with pytest.raises(ValueError):
+        list(homework.read_packages([('XXX', [])]))
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+
+import homework
+import instrument
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [9000, 1, 75]),
+]
+
+
+def run_packages():
+    return [homework.read_package(*package).show_training_info()
+            .get_message() for package in PACKAGES]
+
+
+def test_instrumented_counts():
+    expected = run_packages()
+    original = homework.Running.get_spent_calories
+    instrument.reset()
+    with instrument.instrumented():
+        assert run_packages() == expected
+    assert homework.Running.get_spent_calories is original, (
+        'После выключения должны вернуться исходные методы'
+    )
+    assert 'show_training_info' not in homework.Running.__dict__
+    snapshot = instrument.snapshot()
+    assert snapshot['Running']['read_package']['count'] == 2
+    assert snapshot['Running']['get_spent_calories']['count'] == 2
+    assert snapshot['Swimming']['get_message']['count'] == 1
+    assert snapshot['Running']['show_training_info']['p95'] > 0
+
+    run_packages()
+    assert instrument.snapshot() == snapshot, (
+        'Выключенное инструментирование не должно ничего считать'
+    )
+
+
+def test_prometheus_export(tmp_path):
+    instrument.reset()
+    with instrument.instrumented() as instrumentation:
+        run_packages()
+    path = tmp_path / 'tracker.prom'
+    instrumentation.write_prometheus(str(path))
+    text = path.read_text(encoding='utf-8')
+    assert ('tracker_calls_total{training_type="Running",'
+            'method="read_package"} 2') in text
+    assert 'quantile="0.95"' in text
+    assert ('tracker_latency_seconds_count{training_type="Running",'
+            'method="get_spent_calories"} 2') in text
+    assert 'tracker_latency_seconds_sum{' in text
+
+
+def test_profile_packages(tmp_path):
+    output = tmp_path / 'profile.out'
+    stats = instrument.profile_packages(PACKAGES, str(output))
+    assert output.exists()
+    assert any(name == 'get_spent_calories'
+               for _, _, name in stats.stats)
+
+
+def test_subclass_counted_once(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+    monkeypatch.setattr(homework, '_CONSTRUCTORS',
+                        dict(homework._CONSTRUCTORS))
+
+    @homework.register_workout('CYC')
+    @dataclass
+    class Cycling(homework.Running):
+        LEN_STEP = 5.0
+
+    instrument.reset()
+    with instrument.instrumented():
+        homework.read_package('CYC', [100, 1, 75]).show_training_info()
+        homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    snapshot = instrument.snapshot()
+    assert snapshot['Cycling']['get_spent_calories']['count'] == 1, (
+        'Вызов метода наследника должен учитываться один раз'
+    )
+    assert snapshot['Running']['get_spent_calories']['count'] == 1
+    assert snapshot['Cycling']['show_training_info']['count'] == 1
+    assert 'get_spent_calories' not in Cycling.__dict__
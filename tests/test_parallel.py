@@ -0,0 +1,23 @@
+import pytest
+
+import parallel
+import conftest
+
+PACKAGES = conftest.PACKAGES * 20
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_parallel_runner(ordered):
+    expected = conftest.EXPECTED * 20
+    runner = parallel.ParallelRunner(workers=2, chunk_size=7,
+                                     ordered=ordered)
+    result = list(runner.run(iter(PACKAGES)))
+    if ordered:
+        assert result == expected, (
+            'Параллельный прогон должен сохранять порядок пакетов'
+        )
+    else:
+        assert sorted(result) == sorted(expected)
+    assert runner.stats.records == len(PACKAGES)
+    assert runner.stats.chunks == 9
+    assert runner.stats.throughput > 0
@@ -0,0 +1,113 @@
+import asyncio
+
+import server
+from conftest import EXPECTED, PACKAGES
+
+
+def test_process_line_errors():
+    assert server.process_line('["XXX", [1, 2, 3]]').startswith(
+        server.ERROR_PREFIX)
+    assert server.process_line('["RUN", [1, 0, 75]]').startswith(
+        server.ERROR_PREFIX)
+    assert server.process_line('not json').startswith(server.ERROR_PREFIX)
+
+
+def test_tcp_server_many_clients():
+    async def scenario():
+        ingest = server.IngestServer(max_batch=16, max_pending=4)
+        listener = await ingest.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            results = await asyncio.gather(*[
+                server.send_packages(PACKAGES * 50, port=port)
+                for _ in range(20)
+            ])
+        finally:
+            await ingest.close()
+        return ingest, results
+
+    ingest, results = asyncio.run(scenario())
+    assert all(result == EXPECTED * 50 for result in results), (
+        'Сервер должен отвечать на каждую запись в порядке запросов'
+    )
+    assert ingest.records == 20 * 150
+    assert ingest.batches < ingest.records, (
+        'Записи должны обрабатываться порциями'
+    )
+
+
+def test_unix_server(tmp_path):
+    path = str(tmp_path / 'tracker.sock')
+
+    async def scenario():
+        ingest = server.IngestServer()
+        await ingest.start_unix(path)
+        try:
+            return await server.send_packages(
+                PACKAGES + [('XXX', [1])], path=path)
+        finally:
+            await ingest.close()
+
+    result = asyncio.run(scenario())
+    assert result[:3] == EXPECTED
+    assert result[3].startswith(server.ERROR_PREFIX)
+
+
+def test_overflow_does_not_stop_batcher():
+    async def scenario():
+        ingest = server.IngestServer()
+        listener = await ingest.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            first = await server.send_packages(
+                [('WLK', [1e200, 1, 75, 180])], port=port)
+            second = await asyncio.wait_for(
+                server.send_packages(PACKAGES, port=port), timeout=5)
+        finally:
+            await ingest.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first[0].startswith(server.ERROR_PREFIX + 'OverflowError')
+    assert second == EXPECTED, (
+        'После ошибки в записи сервер должен продолжать отвечать'
+    )
+    assert server.process_line('[' * 100000 + ']' * 100000).startswith(
+        server.ERROR_PREFIX)
+
+
+def send_raw(payload, **options):
+    async def scenario():
+        ingest = server.IngestServer(**options)
+        listener = await ingest.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(payload)
+            writer.write_eof()
+            data = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return data.decode('utf-8').splitlines()
+        finally:
+            await ingest.close()
+
+    return asyncio.run(scenario())
+
+
+def test_invalid_utf8_line_gets_error_reply():
+    responses = send_raw(b'\xff\xfe\n["RUN", [15000, 1, 75]]\n')
+    assert len(responses) == 2
+    assert responses[0].startswith(server.ERROR_PREFIX + 'UnicodeDecodeError')
+    assert responses[1] == EXPECTED[1], (
+        'Запись после ошибочной строки должна быть обработана'
+    )
+
+
+def test_too_long_line_gets_error_reply():
+    long_line = b'[' * 1000 + b']' * 1000 + b'\n'
+    responses = send_raw(long_line + b'["RUN", [15000, 1, 75]]\n' + long_line
+                         + b'["RUN", [15000, 1, 75]]', line_limit=256)
+    assert len(responses) == 4
+    assert responses[0].startswith(server.ERROR_PREFIX)
+    assert responses[2].startswith(server.ERROR_PREFIX)
+    assert responses[1] == responses[3] == EXPECTED[1]
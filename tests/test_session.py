@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+import homework
+import session
+
+
+@pytest.mark.parametrize('workout_type, params, steps, expected', [
+    ('RUN', {}, [{'action': 5000, 'duration': 0.5}] * 3,
+     [15000, 1.5, 75]),
+    ('WLK', {'height': 180}, [{'action': 3000, 'duration': 0.25}] * 4,
+     [12000, 1.0, 75, 180]),
+    ('SWM', {'length_pool': 25},
+     [{'action': 240, 'duration': 0.25, 'count_pool': 10}] * 4,
+     [960, 1.0, 75, 25, 40]),
+])
+def test_session_matches_training(workout_type, params, steps, expected):
+    current = session.TrainingSession(workout_type, weight=75, **params)
+    for delta in steps:
+        current.add(**delta)
+    result = homework.read_package(workout_type, expected)
+    assert current.info_message() == result.show_training_info(), (
+        'Инкрементальный расчёт должен совпадать с расчётом по итогам'
+    )
+    assert current.updates == len(steps)
+
+
+def test_session_update_totals():
+    current = session.TrainingSession('RUN', weight=75)
+    assert current.info_message().speed == 0.0
+    current.update(action=9000, duration=1)
+    current.update(action=15000, duration=1)
+    assert current.training == homework.Running(15000, 1, 75)
+
+
+def test_session_errors():
+    with pytest.raises(ValueError):
+        session.TrainingSession('XXX', weight=75)
+    with pytest.raises(TypeError):
+        session.TrainingSession('WLK', weight=75)
+    current = session.TrainingSession('RUN', weight=75)
+    with pytest.raises(TypeError):
+        current.add(weight=1)
+    with pytest.raises(TypeError):
+        current.add(action=5, weight=1)
+    assert current.training.action == 0, (
+        'Ошибочное обновление не должно менять сессию'
+    )
+    with pytest.raises(TypeError):
+        current.update(foo=1)
+    assert current.updates == 0
+
+
+def test_update_stores_totals_exactly():
+    rnd = random.Random(0)
+    current = session.TrainingSession('RUN', weight=75)
+    for _ in range(200):
+        action = rnd.randint(0, 30000)
+        duration = rnd.uniform(0.01, 3)
+        current.update(action=action, duration=duration)
+        assert current.training.duration == duration
+        assert current.info_message() == homework.read_package(
+            'RUN', [action, duration, 75]).show_training_info()
+    assert current.updates == 200
@@ -0,0 +1,89 @@
+import pickle
+import random
+
+import pytest
+
+import homework
+import sketches
+
+
+def test_topk():
+    top = sketches.TopK(3)
+    for score in [5, 1, 9, 7, 3, 9]:
+        top.add(score, f'item{score}')
+    assert [score for score, _ in top.items()] == [9, 9, 7]
+    other = sketches.TopK(3)
+    other.add(10, 'best')
+    top.merge(other)
+    assert top.items()[0] == (10, 'best')
+    assert len(top) == 3
+
+
+def test_kll_quantiles_and_merge():
+    rnd = random.Random(1)
+    values = [rnd.random() for _ in range(20000)]
+    first = sketches.KLLSketch(k=200, seed=1)
+    second = sketches.KLLSketch(k=200, seed=2)
+    for value in values[:10000]:
+        first.add(value)
+    for value in values[10000:]:
+        second.add(value)
+    first = pickle.loads(pickle.dumps(first))
+    first.merge(second)
+    assert first.count == len(values)
+    assert first._size < len(values) / 10, (
+        'Набросок должен занимать память много меньше числа значений'
+    )
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        estimate = first.quantile(q)
+        rank = sum(value <= estimate for value in ordered) / len(ordered)
+        assert rank == pytest.approx(q, abs=0.03)
+
+
+def test_windowed_expiry():
+    window = sketches.Windowed(10, 2, lambda: sketches.TopK(5))
+    window.pane(0).add(100, 'old')
+    window.pane(5).add(50, 'middle')
+    window.pane(3).add(70, 'late arrival')
+    window.pane(13).add(10, 'new')
+    assert [item for _, item in window.merged(13).items()] == [
+        'late arrival', 'middle', 'new']
+
+
+def test_leaderboard():
+    board = sketches.Leaderboard(window_seconds=3600, pane_seconds=60,
+                                 top_k=2)
+    packages = [('RUN', [15000, 1, 75]), ('RUN', [9000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180]), ('SWM', [720, 1, 80, 25, 40])]
+    for second, package in enumerate(packages):
+        info = homework.read_package(*package).show_training_info()
+        board.add(info, timestamp=second * 100, key=f'user{second}')
+    top = board.top_calories(now=400)
+    assert [key for _, (key, _) in top] == ['user0', 'user1']
+    assert board.speed_quantile('Running', 0.5, now=400) == 5.85
+
+    other = pickle.loads(pickle.dumps(board))
+    other.merge(board)
+    assert other.top_calories(now=400)[0][0] == top[0][0]
+    assert other.speeds['Running'].merged(400).count == 4
+    assert board.top_calories(now=10000) == []
+    with pytest.raises(ValueError):
+        board.speed_quantile('Cycling', 0.5, now=400)
+
+
+def test_merge_leaves_other_unchanged():
+    first = sketches.Leaderboard(top_k=5)
+    second = sketches.Leaderboard(top_k=5)
+    running = homework.read_package('RUN', [15000, 1, 75])
+    second.add(running.show_training_info(), 10, 'second')
+    first.merge(second)
+    first.add(homework.read_package('RUN', [20000, 1, 75])
+              .show_training_info(), 20, 'first')
+    assert [key for _, (key, _) in second.top_calories(30)] == ['second'], (
+        'Объединение не должно связывать структуры двух таблиц'
+    )
+    assert first.speeds['Running'] is not second.speeds['Running']
+    assert second.speeds['Running'].merged(30).count == 1
+    assert [key for _, (key, _) in first.top_calories(30)] == [
+        'first', 'second']
@@ -0,0 +1,68 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import homework
+import splits
+
+SECONDS = 150
+
+
+def per_interval(workout_type, actions, bounds, extra, pools=None):
+    """То, что делалось раньше: объект тренировки на каждый отрезок."""
+    result = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        data = [int(sum(actions[start:end])), (end - start) * 1.0 / 3600,
+                75] + extra
+        if pools is not None:
+            data.append(float(sum(pools[start:end])))
+        result.append(
+            homework.read_package(workout_type, data).show_training_info())
+    return result
+
+
+@pytest.mark.parametrize('workout_type, params, extra', [
+    ('RUN', {}, []),
+    ('WLK', {'height': 180}, [180]),
+])
+def test_minute_splits(workout_type, params, extra):
+    actions = [(second * 7) % 4 for second in range(SECONDS)]
+    training = splits.SampledTraining(workout_type, actions, weight=75,
+                                      **params)
+    result = training.splits(60)
+    assert len(result) == 3
+    expected = per_interval(workout_type, actions, [0, 60, 120, 150],
+                            extra)
+    assert [result.info_message(i) for i in range(3)] == expected, (
+        'Отрезки должны совпадать с расчётом через объекты тренировок'
+    )
+
+
+def test_swimming_splits():
+    strokes = [1] * SECONDS
+    pools = [1 if second % 30 == 29 else 0 for second in range(SECONDS)]
+    training = splits.SampledTraining('SWM', strokes, weight=75,
+                                      length_pool=25, pool_counts=pools)
+    result = training.splits(60)
+    expected = per_interval('SWM', strokes, [0, 60, 120, 150], [25], pools)
+    assert [result.info_message(i) for i in range(3)] == expected
+
+
+def test_laps_and_total():
+    actions = [2] * 1000
+    training = splits.SampledTraining('RUN', actions, weight=75)
+    laps = training.laps(0.5)
+    # 0.5 км = 769.2 шага по 0.65 м, то есть 385 отсчётов
+    assert len(laps) == 3
+    assert laps.distance[0] >= 0.5
+    assert laps.distance.sum() == pytest.approx(training.total().distance[0])
+    total = training.total().info_message(0)
+    assert total == homework.read_package(
+        'RUN', [2000, 1000 / 3600, 75]).show_training_info()
+
+
+def test_rolling_speed():
+    training = splits.SampledTraining('RUN', [1, 3] * 10, weight=75)
+    speed = training.rolling_speed(2)
+    assert len(speed) == 19
+    assert np.allclose(speed, 4 * 0.65 / 1000 / (2 / 3600))
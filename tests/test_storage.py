@@ -0,0 +1,45 @@
+import pytest
+
+import homework
+import storage
+import conftest
+
+PACKAGES = conftest.PACKAGES + [('RUN', [1206, 12, 6])]
+MESSAGES = [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+@pytest.fixture
+def results_path(tmp_path):
+    path = str(tmp_path / 'results.trk')
+    with storage.ResultWriter(path, buffer_records=3) as writer:
+        for package in PACKAGES:
+            writer.write_training(homework.read_package(*package))
+    return path
+
+
+def test_write_read_roundtrip(results_path):
+    with storage.ResultReader(results_path) as reader:
+        assert len(reader) == len(PACKAGES)
+        assert reader.training_types == ['Swimming', 'Running',
+                                         'SportsWalking']
+        assert list(reader) == MESSAGES, (
+            'Прочитанные записи должны совпадать с записанными'
+        )
+
+
+def test_numpy_columns(results_path):
+    np = pytest.importorskip('numpy')
+    with storage.ResultReader(results_path) as reader:
+        columns = reader.columns()
+        assert np.shares_memory(columns['calories'], columns)
+        assert list(columns['calories']) == [
+            info.calories for info in MESSAGES]
+        assert list(columns['code']) == [0, 1, 2, 1]
+
+
+def test_reader_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'\0' * storage.HEADER_SIZE)
+    with pytest.raises(ValueError):
+        storage.ResultReader(str(path))
@@ -0,0 +1,51 @@
+import io
+import json
+
+import pytest
+
+import stream
+from conftest import EXPECTED, PACKAGES
+
+
+def test_read_csv():
+    lines = ['SWM,720,1,80,25,40\n', '\n', 'RUN,15000,1.5,75\n']
+    assert list(stream.read_records(lines, 'csv')) == [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1.5, 75]),
+    ]
+
+
+def test_read_jsonl():
+    lines = [json.dumps(list(PACKAGES[0])),
+             json.dumps({'workout_type': 'RUN', 'data': [15000, 1, 75]})]
+    assert list(stream.read_records(lines, 'jsonl')) == [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+    ]
+
+
+def test_read_records_is_lazy():
+    def lines():
+        yield 'RUN,15000,1,75\n'
+        raise AssertionError('Записи должны читаться лениво')
+
+    records = stream.read_records(lines(), 'csv')
+    assert next(records) == ('RUN', [15000, 1, 75])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 1024])
+def test_process_stream(chunk_size):
+    out = io.StringIO()
+    count = stream.process_stream(iter(PACKAGES), out, chunk_size)
+    assert count == len(PACKAGES)
+    assert out.getvalue().splitlines() == EXPECTED
+
+
+def test_main_reads_file(tmp_path, capsys):
+    path = tmp_path / 'packages.csv'
+    path.write_text('\n'.join(
+        ','.join([code] + [str(value) for value in data])
+        for code, data in PACKAGES
+    ))
+    assert stream.main([str(path)]) == len(PACKAGES)
+    assert capsys.readouterr().out.splitlines() == EXPECTED
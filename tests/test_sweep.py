@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import batch
+import homework
+import sweep
+
+COLUMNS = {
+    'RUN': {'action': [15000, 9000, 1206], 'duration': [1, 1.5, 12],
+            'weight': [75, 60, 6]},
+    'WLK': {'action': [9000, 420, 1206], 'duration': [1, 4, 12],
+            'weight': [75, 20, 6], 'height': [180, 42, 12]},
+    'SWM': {'action': [720, 420, 1206], 'duration': [1, 4, 12],
+            'weight': [80, 20, 6], 'length_pool': [25, 42, 12],
+            'count_pool': [40, 4, 6]},
+}
+VARIANTS = {
+    'RUN': [{}, {'coeff_calorie_1': 17}, {'coeff_calorie_2': 21.5}],
+    'WLK': [{'coeff_calorie_1': 0.04, 'coeff_calorie_3': 3}, {}],
+    'SWM': [{'LEN_STEP': 1.5}, {'coeff_calorie_1': 1.2}],
+}
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_sweep_matches_patched_classes(workout_type, monkeypatch):
+    columns = COLUMNS[workout_type]
+    variants = VARIANTS[workout_type]
+    cls = homework.WORKOUT_TYPES[workout_type]
+    before = {name: getattr(cls, name) for name in sweep.TUNABLE
+              if hasattr(cls, name)}
+
+    result = sweep.sweep_calories(workout_type, columns, variants)
+    assert result.shape == (len(variants), 3)
+    assert {name: getattr(cls, name) for name in before} == before, (
+        'Перебор не должен менять константы классов'
+    )
+
+    for row, variant in zip(result, variants):
+        with monkeypatch.context() as patch:
+            for name, value in variant.items():
+                patch.setattr(cls, name, value)
+            expected = batch.compute_batch(workout_type, columns).calories
+            scalar = [homework.read_package(workout_type, list(data))
+                      .get_spent_calories()
+                      for data in zip(*columns.values())]
+        assert row.tolist() == expected.tolist() == scalar
+
+
+def test_sweep_unknown_constant():
+    with pytest.raises(ValueError):
+        sweep.sweep_calories('RUN', COLUMNS['RUN'],
+                             [{'coeff_calorie_3': 1}])
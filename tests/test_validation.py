@@ -0,0 +1,73 @@
+import pytest
+
+import homework
+import validation
+
+
+@pytest.mark.parametrize('package', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1.5, 75]),
+    ('WLK', [0, 1, 75, 180]),
+])
+def test_valid_packages(package):
+    assert validation.validate_package(*package) is None
+    homework.read_package(*package).show_training_info()
+
+
+@pytest.mark.parametrize('package, field', [
+    (('XXX', [1, 2, 3]), 'код'),
+    (('RUN', [15000, 1]), 'значений'),
+    (('RUN', [15000, 0, 75]), 'duration'),
+    (('WLK', [9000, 1, 75, -180]), 'height'),
+    (('RUN', [15000.5, 1, 75]), 'action'),
+    (('RUN', ['15000', 1, 75]), 'action'),
+    (('RUN', [True, 1, 75]), 'action'),
+    (('SWM', [720, 1, 80, 25, float('nan')]), 'count_pool'),
+    (('WLK', [1e200, 1, 75, 180]), 'action'),
+    (('RUN', [10 ** 400, 1, 75]), 'action'),
+    (('RUN', [15000, 1, -10 ** 400]), 'weight'),
+    (('RUN', [15000, 1e-300, 75]), 'duration'),
+    (('RUN', None), 'список'),
+    ((['RUN'], [15000, 1, 75]), 'строкой'),
+])
+def test_invalid_packages(package, field):
+    reason = validation.validate_package(*package)
+    assert reason is not None and field in reason, (
+        f'Пакет {package} должен быть отклонён по {field}'
+    )
+
+
+def test_numpy_scalars_are_numbers():
+    np = pytest.importorskip('numpy')
+    package = ('WLK', [np.int64(9000), np.float64(1), np.int32(75),
+                       np.float32(180)])
+    assert validation.validate_package(*package) is None
+
+
+def test_split_packages():
+    packages = [('RUN', [15000, 1, 75]), ('RUN', [15000, 0, 75]),
+                ('SWM', [720, 1, 80, 25, 40])]
+    valid, rejects = validation.split_packages(iter(packages))
+    assert valid == [packages[0], packages[2]]
+    assert [package for package, _ in rejects] == [packages[1]]
+
+
+def test_validate_columns():
+    np = pytest.importorskip('numpy')
+    valid, reasons = validation.validate_columns('WLK', {
+        'action': [9000, 9000.5, 9000, 9000],
+        'duration': [1, 1, 0, 1],
+        'weight': [75, 75, 75, float('inf')],
+        'height': [180, -1, 180, 180],
+    })
+    assert valid.tolist() == [True, False, False, False]
+    assert sorted(reasons) == [1, 2, 3]
+    assert reasons[1].startswith('action')
+    assert reasons[2].startswith('duration')
+    assert reasons[3].startswith('weight')
+    assert isinstance(valid, np.ndarray)
+    valid, reasons = validation.validate_columns('RUN', {
+        'action': [1e200], 'duration': [1], 'weight': [75]})
+    assert not valid.any() and reasons[0].startswith('action')
+    with pytest.raises(ValueError):
+        validation.validate_columns('RUN', {'action': [1]})
@@ -0,0 +1,185 @@
+"""
+Проверка пакетов датчиков до создания объектов тренировок.
+
+Ошибочный пакет (не то количество значений, нечисловые значения,
+нулевая длительность, отрицательный рост) без проверки падает глубоко
+внутри ``get_mean_speed`` или ``get_spent_calories``. Здесь такие пакеты
+отсеиваются заранее: проверка возвращает причину отказа строкой, а не
+исключением, поэтому поток хороших пакетов не тормозится обработкой
+ошибок. Для столбцов (``batch.compute_batch``) есть векторная проверка
+``validate_columns``.
+
+Правила задаются по имени поля в ``FIELD_RULES`` и применяются ко всем
+зарегистрированным видам тренировок, включая сторонние.
+"""
+import math
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from numbers import Real
+from typing import (Callable, Dict, Iterable, Iterator, List, Mapping,
+                    Optional, Sequence, Tuple)
+
+from homework import WORKOUT_TYPES
+
+Package = Tuple[str, Sequence[float]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Ограничение на значение поля."""
+
+    minimum: float = -math.inf  # Нижняя граница
+    inclusive: bool = False     # Допускается ли равенство границе
+    integer: bool = False       # Должно ли значение быть целым
+    maximum: float = math.inf   # Верхняя граница (включительно)
+
+    def check(self, value: float) -> Optional[str]:
+        """Вернуть причину отказа или ``None``."""
+        if self.integer and value != int(value):
+            return f'должно быть целым, получено {value}'
+        if value < self.minimum or (value == self.minimum
+                                    and not self.inclusive):
+            sign = '>=' if self.inclusive else '>'
+            return f'должно быть {sign} {self.minimum}, получено {value}'
+        if value > self.maximum:
+            return f'должно быть <= {self.maximum}, получено {value}'
+        return None
+
+
+# Границы значений держат промежуточные результаты формул (например,
+# квадрат скорости у спортивной ходьбы) далеко от переполнения float:
+# без них пакет ['WLK', [1e200, 1, 75, 180]] падает с OverflowError.
+MAX_VALUE = 1e9
+MIN_POSITIVE = 1e-6
+
+FIELD_RULES: Dict[str, Rule] = {
+    'action': Rule(0, inclusive=True, integer=True, maximum=MAX_VALUE),
+    'duration': Rule(MIN_POSITIVE, inclusive=True, maximum=MAX_VALUE),
+    'weight': Rule(MIN_POSITIVE, inclusive=True, maximum=MAX_VALUE),
+    'height': Rule(MIN_POSITIVE, inclusive=True, maximum=MAX_VALUE),
+    'length_pool': Rule(MIN_POSITIVE, inclusive=True, maximum=MAX_VALUE),
+    'count_pool': Rule(0, inclusive=True, maximum=MAX_VALUE),
+}
+# для полей без правила проверяется, что это конечное число в пределах
+# MAX_VALUE по модулю
+DEFAULT_RULE = Rule(-MAX_VALUE, inclusive=True, maximum=MAX_VALUE)
+
+
+@lru_cache(maxsize=None)
+def _class_rules(cls: type) -> Tuple[Tuple[str, Rule], ...]:
+    return tuple((field.name, FIELD_RULES.get(field.name, DEFAULT_RULE))
+                 for field in fields(cls))
+
+
+def _rules(workout_type: str) -> Tuple[Tuple[str, Rule], ...]:
+    """Правила полей вида тренировки (строятся один раз на класс)."""
+    return _class_rules(WORKOUT_TYPES[workout_type])
+
+
+def validate_package(workout_type: str,
+                     data: Sequence[float]) -> Optional[str]:
+    """
+    Проверить один пакет.
+    Возвращает причину отказа либо ``None``, если пакет корректен.
+    """
+    if not isinstance(workout_type, str):
+        return f'код тренировки должен быть строкой, получено {workout_type!r}'
+    if workout_type not in WORKOUT_TYPES:
+        return f'неизвестный код тренировки {workout_type!r}'
+    rules = _rules(workout_type)
+    try:
+        size = len(data)
+    except TypeError:
+        return f'ожидается список значений, получено {data!r}'
+    if size != len(rules):
+        return f'ожидается {len(rules)} значений, получено {size}'
+    for (name, rule), value in zip(rules, data):
+        reason = _check_value(rule, value)
+        if reason is not None:
+            return f'{name}: {reason}'
+    return None
+
+
+def _check_value(rule: Rule, value: object) -> Optional[str]:
+    """Проверить одно значение пакета: тип, конечность и правило поля."""
+    # numbers.Real принимает и скаляры NumPy (np.int64, np.float64)
+    if isinstance(value, bool) or not isinstance(value, Real):
+        return f'ожидается число, получено {value!r}'
+    try:
+        finite = math.isfinite(value)
+    except OverflowError:
+        # целое вне диапазона float: его отклонит граница правила
+        finite = True
+    if not finite:
+        return f'ожидается конечное число, получено {value}'
+    return rule.check(value)
+
+
+def filter_packages(
+        packages: Iterable[Package],
+        on_reject: Callable[[Package, str], None]) -> Iterator[Package]:
+    """
+    Пропустить дальше только корректные пакеты.
+    Для ошибочных вызывается ``on_reject(пакет, причина)``.
+    """
+    for package in packages:
+        reason = validate_package(*package)
+        if reason is None:
+            yield package
+        else:
+            on_reject(package, reason)
+
+
+def split_packages(
+        packages: Iterable[Package]
+) -> Tuple[List[Package], List[Tuple[Package, str]]]:
+    """Разделить пакеты на корректные и отклонённые с причинами."""
+    rejects: List[Tuple[Package, str]] = []
+    valid = list(filter_packages(
+        packages, lambda package, reason: rejects.append((package, reason))
+    ))
+    return valid, rejects
+
+
+def validate_columns(workout_type: str, columns: Mapping[str, Sequence]):
+    """
+    Векторная проверка столбцов для ``batch.compute_batch``.
+
+    Возвращает пару: булев массив корректных строк и словарь
+    ``{номер строки: причина}`` для отклонённых. Причина - первое
+    нарушенное правило в порядке полей.
+    """
+    import numpy as np
+
+    if workout_type not in WORKOUT_TYPES:
+        raise ValueError(f"Такой тренировки - {workout_type}, не найдено")
+    rules = _rules(workout_type)
+    missing = [name for name, _ in rules if name not in columns]
+    if missing:
+        raise ValueError(
+            f"Для тренировки {workout_type} не хватает столбцов: "
+            f"{', '.join(missing)}"
+        )
+
+    valid: Optional[np.ndarray] = None
+    reasons: Dict[int, str] = {}
+    for name, rule in rules:
+        values = np.asarray(columns[name], dtype=np.float64)
+        if valid is None:
+            valid = np.ones(len(values), dtype=bool)
+        bad = ~np.isfinite(values)
+        with np.errstate(invalid='ignore'):
+            if rule.integer:
+                bad |= values != np.trunc(values)
+            if rule.inclusive:
+                bad |= values < rule.minimum
+            else:
+                bad |= values <= rule.minimum
+            bad |= values > rule.maximum
+        for index in np.flatnonzero(bad & valid):
+            value = values[index]
+            reason = (rule.check(float(value)) if np.isfinite(value)
+                      else f'ожидается конечное число, получено {value}')
+            reasons[int(index)] = f'{name}: {reason}'
+        valid &= ~bad
+    return valid, reasons